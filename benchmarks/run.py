@@ -0,0 +1,295 @@
+"""
+Benchmark harness for the Arena Blitz games.
+
+Each scenario plays one game under SDL's dummy video driver with an
+uncapped clock, a fixed seed and a scripted input stream, and measures
+frames per second, per-phase frame times (via common.profiler) and the
+peak resident memory of the process. Scenarios run one at a time in
+fresh worker processes so their memory peaks do not mix.
+
+    python -m benchmarks.run --out results.json
+    python -m benchmarks.run --compare results.json --tolerance 0.1
+    python -m benchmarks.run --scenario shadow_ops --spawn-rate 1 --frames 2000
+
+The round is kept going after a collision, so entity counts stay at the
+level the scenario asks for instead of resetting on every game over.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from multiprocessing import get_context
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# name, game, new_state() options, input script
+SCENARIOS = [
+    ("cyber_ninja_assault", "cyber_ninja_assault", {}, "random"),
+    ("cyber_ninja_crowd", "cyber_ninja_assault", {"enemy_count": 200, "star_count": 200}, "random"),
+    ("shadow_ops", "shadow_ops", {}, "random"),
+    ("shadow_ops_swarm", "shadow_ops", {"spawn_rate": 1}, "sweep"),
+]
+
+# new_state() options each game understands
+GAME_OPTIONS = {
+    "cyber_ninja_assault": ("enemy_count", "star_count"),
+    "shadow_ops": ("spawn_rate",),
+}
+
+DEFAULT_FRAMES = 1200
+WARMUP_FRAMES = 60
+
+
+def load_script(script, seed):
+    """
+    Build an input policy for a scenario.
+
+    Args:
+        script (str): 'idle', 'random', 'sweep', or the path of a file of
+            whitespace-separated per-frame action bitmasks, replayed in a
+            loop. Recorded .arb sessions are handled by run_scenario().
+        seed (int): Seed for the random script.
+
+    Returns:
+        callable: A policy mapping a state to an action bitmask.
+    """
+    from common.simulation import ACTION_LEFT, ACTION_RIGHT, idle_policy, make_random_policy
+
+    if script == "idle":
+        return idle_policy
+    if script == "random":
+        return make_random_policy(seed)
+    if script == "sweep":
+        # Cross the arena back and forth, one pass every two seconds
+        def sweep(state):
+            return ACTION_LEFT if (state.frame // 120) % 2 else ACTION_RIGHT
+        return sweep
+
+    with open(script) as f:
+        frames = [int(token, 0) for token in f.read().split()] or [0]
+    position = [0]
+
+    def recorded(state):
+        inputs = frames[position[0] % len(frames)]
+        position[0] += 1
+        return inputs
+    return recorded
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KiB, if known."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_scenario(name, game_name, options, script, frames, seed, dirty=False, backend="software"):
+    """Play one scenario and return its measurements. Runs in a worker."""
+    from common.simulation import enable_headless
+
+    enable_headless()
+
+    import pygame
+
+    from common.dirty import make_renderer
+    from common.profiler import profiler
+    from common.replay import Replay, ReplayPlayer
+    from common.runtime import Runtime
+    from common.simulation import idle_policy, load_game
+
+    game = load_game(game_name)
+    ctx = Runtime(caption=name, backend=backend)
+    game.preload()
+    surface = ctx.begin(game.LOGICAL_SIZE)
+    render = game.render
+    renderer = make_renderer(dirty)
+    clock = ctx.clock
+
+    if script.endswith(".arb"):
+        # A recorded session: its own seeds and options, looped
+        replay = Replay.load(script)
+        if replay.game != game_name:
+            raise ValueError(f"{script} is a {replay.game} replay, not {game_name}")
+        player = ReplayPlayer(game, replay)
+
+        def advance(inputs):
+            if not player.advance():
+                player.seek(0)
+                player.advance()
+            return player.state
+
+        policy = idle_policy
+        state = player.state
+    else:
+        policy = load_script(script, seed)
+        state = game.new_state(seed, **options)
+        step = game.step
+
+        def advance(inputs):
+            step(state, inputs)
+            state.game_over = False
+            return state
+
+    def frame():
+        nonlocal state
+        clock.tick()  # uncapped
+        profiler.begin_frame()
+        with profiler.phase("input"):
+            pygame.event.pump()
+            inputs = policy(state)
+        with profiler.phase("update"):
+            state = advance(inputs)
+        with profiler.phase("draw"):
+            render(surface, state, renderer)
+        with profiler.phase("flip"):
+            renderer.present(ctx)
+        profiler.end_frame()
+
+    for _ in range(WARMUP_FRAMES):
+        frame()
+
+    profiler.enabled = True
+    profiler.reset(window=frames)
+    start = time.perf_counter()
+    for _ in range(frames):
+        frame()
+    elapsed = time.perf_counter() - start
+
+    stats = profiler.stats()
+    return {
+        "game": game_name,
+        "options": options,
+        "script": script,
+        "seed": seed,
+        "dirty": dirty,
+        "backend": "gpu" if ctx.renderer is not None else "software",
+        "frames": frames,
+        "seconds": elapsed,
+        "fps": frames / elapsed,
+        "entities": {"enemies": len(state.enemies)},
+        "phases": stats["phases"],
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+# Settings a result must share with its baseline to be compared, and the
+# value assumed when a results file predates the field
+COMPARED_SETTINGS = {"options": {}, "script": None, "dirty": False, "backend": "software"}
+
+
+def mismatched_settings(result, base):
+    """Return the names of the settings two results were not run with alike."""
+    return [field for field, default in COMPARED_SETTINGS.items()
+            if result.get(field, default) != base.get(field, default)]
+
+
+def compare(results, baseline, tolerance):
+    """
+    Print a comparison against a baseline run.
+
+    A scenario regresses when its FPS drops, or its p95 frame time grows,
+    by more than tolerance (a fraction). Scenarios run with different
+    options, script, dirty rendering or backend than the baseline are
+    flagged and not scored.
+
+    Returns:
+        list: Names of the regressed scenarios.
+    """
+    regressions = []
+    print(f"{'scenario':<22}{'fps':>10}{'base':>10}{'change':>9}{'p95 ms':>9}{'base':>9}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<22}{result['fps']:>10.1f}{'-':>10}")
+            continue
+        mismatched = mismatched_settings(result, base)
+        if mismatched:
+            print(f"{name:<22}{result['fps']:>10.1f}{base['fps']:>10.1f}"
+                  f"  not compared, {', '.join(mismatched)} differ")
+            continue
+        fps_change = result["fps"] / base["fps"] - 1.0
+        p95 = result["phases"]["frame"]["p95"]
+        base_p95 = base["phases"]["frame"]["p95"]
+        regressed = fps_change < -tolerance or p95 > base_p95 * (1.0 + tolerance)
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<22}{result['fps']:>10.1f}{base['fps']:>10.1f}{fps_change:>+9.1%}"
+              f"{p95:>9.2f}{base_p95:>9.2f}{flag}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the games headless with an uncapped frame rate.")
+    parser.add_argument("--scenario", action="append", help="run only these scenarios (repeatable)")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="measured frames per scenario")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--script", help="override the input script: idle, random, sweep, a file or a .arb replay")
+    parser.add_argument("--enemies", type=int, help="Cyber Ninja enemy count")
+    parser.add_argument("--stars", type=int, help="Cyber Ninja star count")
+    parser.add_argument("--spawn-rate", type=int, help="Shadow Ops frames between spawns")
+    parser.add_argument("--dirty", action="store_true", help="render with dirty rectangles")
+    parser.add_argument("--backend", choices=("software", "gpu"), default="software",
+                        help="rendering backend (default software)")
+    parser.add_argument("--out", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare against a results file from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown before failing --compare")
+    args = parser.parse_args()
+
+    overrides = {}
+    if args.enemies is not None:
+        overrides["enemy_count"] = args.enemies
+    if args.stars is not None:
+        overrides["star_count"] = args.stars
+    if args.spawn_rate is not None:
+        overrides["spawn_rate"] = args.spawn_rate
+
+    results = {}
+    for name, game_name, options, script in SCENARIOS:
+        if args.scenario and name not in args.scenario:
+            continue
+        options = dict(options)
+        for key, value in overrides.items():
+            if key in GAME_OPTIONS[game_name]:
+                options[key] = value
+        # A fresh process per scenario keeps peak memory per scenario. The
+        # pool is closed, not terminated: SDL catches the SIGTERM that
+        # terminate() sends, and the worker would never exit
+        pool = get_context("spawn").Pool(1)
+        try:
+            result = pool.apply(run_scenario, (name, game_name, options, args.script or script, args.frames,
+                                               args.seed, args.dirty, args.backend))
+        finally:
+            pool.close()
+            pool.join()
+        results[name] = result
+        phases = result["phases"]
+        print(f"{name:<22}{result['fps']:>9.1f} fps  frame p50 {phases['frame']['p50']:.2f} ms"
+              f"  p95 {phases['frame']['p95']:.2f} ms  peak {result['peak_rss_kb']} KiB")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({
+                "meta": {
+                    "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                },
+                "results": results,
+            }, f, indent=1)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
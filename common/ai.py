@@ -0,0 +1,143 @@
+"""
+Level-of-detail scheduling for crowds of enemies that chase a target.
+
+``ChaseAI`` keeps the positions and chase vectors of a crowd in NumPy
+arrays and moves the whole crowd in one batched operation per tick. How
+often each enemy decides where to head depends on its distance from the
+target:
+
+- near enemies, within ``near`` pixels, decide every tick;
+- far enemies decide every ``far_interval`` ticks and in between keep
+  moving along the vector they last chose, so their motion stays smooth
+  rather than jumping every few ticks;
+- at most ``budget`` far decisions are made in one tick, stalest first,
+  so a large wave falling due at once is spread over the next ticks.
+
+The schedule counts ticks and decisions, never wall time, so a round plays
+out the same on every machine and replays stay exact. A crowd no bigger
+than ``full_rate`` is not scheduled at all: every enemy decides every tick.
+"""
+import numpy as np
+
+from .settings import AI_DECISION_BUDGET, AI_FAR_INTERVAL, AI_NEAR_DISTANCE
+
+
+class ChaseAI:
+    """
+    Structure-of-arrays chase steering for a fixed set of enemy Rects.
+
+    The Rects passed in stay the enemies' public form: update() writes the
+    new positions back to them, so drawing and bot code can keep using
+    them. Positions are rounded to whole pixels each tick, the way
+    pygame.Rect rounds the float moves assigned to it.
+    """
+
+    def __init__(self, rects, full_rate=0, near=AI_NEAR_DISTANCE, far_interval=AI_FAR_INTERVAL,
+                 budget=AI_DECISION_BUDGET):
+        """
+        Initialize the crowd.
+
+        Args:
+            rects (list): The enemies' pygame.Rects, kept by reference.
+            full_rate (int): Crowds up to this size decide every tick.
+            near (int): Distance in pixels, on either axis, within which
+                an enemy decides every tick.
+            far_interval (int): Ticks between the decisions of a far enemy.
+            budget (int): Most far decisions made in one tick.
+        """
+        self.rects = rects
+        self.full_rate = full_rate
+        self.near = near
+        self.far_interval = far_interval
+        self.budget = budget
+        n = len(rects)
+        self.count = n
+        self.x = np.array([rect.x for rect in rects], dtype=np.float64)
+        self.y = np.array([rect.y for rect in rects], dtype=np.float64)
+        self.width = np.array([rect.width for rect in rects], dtype=np.float64)
+        self.height = np.array([rect.height for rect in rects], dtype=np.float64)
+        # Chase vector per enemy, each component -1, 0 or 1
+        self.dx = np.zeros(n, dtype=np.float64)
+        self.dy = np.zeros(n, dtype=np.float64)
+        # Tick of each enemy's latest decision; all are due on the first
+        self.decided = np.full(n, -far_interval, dtype=np.int64)
+        self.tick = 0
+        self.decisions = 0
+        # Scratch space, so a tick allocates no new arrays
+        self.gap = np.zeros(n, dtype=np.float64)
+        self.gap_y = np.zeros(n, dtype=np.float64)
+        self.due = np.zeros(n, dtype=bool)
+        self.test = np.zeros(n, dtype=bool)
+
+    def __len__(self):
+        return self.count
+
+    def update(self, target, speed):
+        """
+        Advance the crowd by one tick.
+
+        Args:
+            target (tuple): The (x, y) point enemies head for, compared
+                against their own top-left corners.
+            speed (float): Distance moved along each axis this tick.
+        """
+        if not self.count:
+            return
+        tx, ty = target
+        due = self._schedule(tx, ty)
+        if due is None:
+            np.sign(tx - self.x, out=self.dx)
+            np.sign(ty - self.y, out=self.dy)
+            self.decisions += self.count
+        else:
+            self.dx[due] = np.sign(tx - self.x[due])
+            self.dy[due] = np.sign(ty - self.y[due])
+            self.decided[due] = self.tick
+            self.decisions += len(due)
+        self._advance(self.x, self.dx, speed)
+        self._advance(self.y, self.dy, speed)
+        self.tick += 1
+
+        for rect, x, y in zip(self.rects, self.x.tolist(), self.y.tolist()):
+            rect.topleft = (x, y)
+
+    def _schedule(self, tx, ty):
+        # Indices of the enemies deciding this tick; None for all of them
+        if self.count <= self.full_rate:
+            return None
+        gap, gap_y, due, test = self.gap, self.gap_y, self.due, self.test
+        np.subtract(self.x, tx, out=gap)
+        np.abs(gap, out=gap)
+        np.subtract(self.y, ty, out=gap_y)
+        np.abs(gap_y, out=gap_y)
+        np.maximum(gap, gap_y, out=gap)
+        np.less_equal(gap, self.near, out=due)
+        # Far enemies whose last decision is old enough
+        np.less_equal(self.decided, self.tick - self.far_interval, out=test)
+        test &= ~due
+        waiting = np.flatnonzero(test)
+        if len(waiting) > self.budget:
+            # Stalest first; the rest wait for a later tick
+            order = np.argsort(self.decided[waiting], kind="stable")
+            waiting = waiting[order[:self.budget]]
+        return np.concatenate((np.flatnonzero(due), waiting))
+
+    @staticmethod
+    def _advance(position, direction, speed):
+        # position += direction * speed, rounded half away from zero
+        moved = position + direction * speed
+        np.copysign(np.floor(np.abs(moved) + 0.5), moved, out=position)
+
+    def overlaps(self, rect):
+        """Whether any enemy intersects rect (same rule as Rect.colliderect)."""
+        if not self.count:
+            return False
+        hit, test = self.due, self.test
+        np.less(self.x, rect.right, out=hit)
+        np.greater(self.x + self.width, rect.left, out=test)
+        hit &= test
+        np.less(self.y, rect.bottom, out=test)
+        hit &= test
+        np.greater(self.y + self.height, rect.top, out=test)
+        hit &= test
+        return bool(hit.any())
@@ -0,0 +1,229 @@
+"""
+Central image cache for the Arena Blitz game launcher and games.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import pygame
+
+from .bake import load_scaled
+from .settings import ASSET_CACHE_BUDGET, BAKE_CACHE_ENABLED, BASE_DIR
+
+
+def surface_bytes(surface):
+    """Return the number of bytes of pixel data a surface holds."""
+    return surface.get_pitch() * surface.get_height()
+
+
+class AssetManager:
+    """
+    A memoizing, budgeted cache of loaded images.
+
+    Images are loaded the first time they are asked for and kept keyed by
+    (path, scale, alpha), so each file is decoded and scaled once. Stored
+    surfaces are converted to the display format as soon as a display
+    exists; images requested before that are converted on their next
+    lookup. When the resident pixel data exceeds the byte budget the least
+    recently used images are evicted.
+
+    Images requested at an explicit target size go through the on-disk
+    bake cache (see ``common.bake``), so after the first run they are
+    mapped straight from a raw blob instead of being decoded and scaled.
+
+    Images can also be streamed in on worker threads by ``common.loader``;
+    ``pending`` maps their keys to the futures of decodes in flight.
+    """
+
+    def __init__(self, budget_bytes=ASSET_CACHE_BUDGET, bake=BAKE_CACHE_ENABLED):
+        """
+        Initialize the manager.
+
+        Args:
+            budget_bytes (int): Most bytes of pixel data kept resident.
+            bake (bool): Whether to use the on-disk bake cache.
+        """
+        self.budget_bytes = budget_bytes
+        self.bake = bake
+        self.lock = threading.RLock()
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.unconverted = set()
+        self.pending = {}
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def key(self, path, scale=1.0, alpha=True):
+        """Return the cache key for an image request."""
+        if not os.path.isabs(path):
+            path = os.path.join(BASE_DIR, path)
+        if not isinstance(scale, (int, float)):
+            scale = tuple(scale)
+        return (os.path.normpath(path), scale, bool(alpha))
+
+    def image(self, path, scale=1.0, alpha=True):
+        """
+        Get an image, loading it on first use.
+
+        Args:
+            path (str): The image file, absolute or relative to the
+                project root.
+            scale: A scale factor, or a (width, height) target size.
+            alpha (bool): Whether to keep per-pixel alpha (convert_alpha)
+                or use the plain display format (convert).
+
+        Returns:
+            pygame.Surface: The shared image. Treat it as read-only.
+        """
+        key = self.key(path, scale, alpha)
+        future = self.pending.get(key)
+        if future is not None:
+            # Being decoded on a loader thread; wait rather than decode twice
+            future.result()
+        with self.lock:
+            surface = self.entries.get(key)
+            if surface is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                if key in self.unconverted:
+                    surface = self._convert(key, surface)
+                return surface
+
+            self.misses += 1
+            surface = self.load(*key)
+            self._store(key, surface)
+            return self._convert(key, surface)
+
+    def preload(self, path, scale=1.0, alpha=True):
+        """
+        Decode an image into the cache without converting it.
+
+        Safe to call from a worker thread: the decode happens outside the
+        lock and display conversion is left to the first image() lookup,
+        which happens on the thread that draws.
+        """
+        key = self.key(path, scale, alpha)
+        with self.lock:
+            if key in self.entries:
+                return
+        surface = self.load(*key)
+        with self.lock:
+            if key not in self.entries:
+                self._store(key, surface)
+                self.unconverted.add(key)
+
+    def load(self, path, scale, alpha):
+        """
+        Load an image from the bake cache, or decode and scale it from disk.
+
+        Args:
+            path (str): The absolute image path.
+            scale: A scale factor, or a (width, height) target size.
+            alpha (bool): Whether the image keeps per-pixel alpha.
+
+        Returns:
+            pygame.Surface: The image, not yet display-converted.
+        """
+        if self.bake and isinstance(scale, tuple):
+            return load_scaled(path, scale, alpha, lambda: self.decode(path, scale))
+        return self.decode(path, scale)
+
+    def decode(self, path, scale):
+        """Decode an image file and scale it, bypassing every cache."""
+        try:
+            image = pygame.image.load(path)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Error loading image {path}: {e}")
+            # Return a placeholder surface
+            surf = pygame.Surface((50, 50))
+            surf.fill((255, 0, 255))  # Magenta for missing textures
+            return surf
+
+        if isinstance(scale, tuple):
+            if scale != image.get_size():
+                image = pygame.transform.scale(image, scale)
+        elif scale != 1.0:
+            new_size = (int(image.get_width() * scale), int(image.get_height() * scale))
+            image = pygame.transform.scale(image, new_size)
+        return image
+
+    def finalize(self, limit=None):
+        """
+        Convert preloaded images to the display format. Main thread only.
+
+        Args:
+            limit (int): Most images to convert in this call.
+
+        Returns:
+            int: Images still waiting for conversion.
+        """
+        if pygame.display.get_surface() is None:
+            return len(self.unconverted)
+        with self.lock:
+            for key in list(self.unconverted)[:limit]:
+                self._convert(key, self.entries[key])
+            return len(self.unconverted)
+
+    def _convert(self, key, surface):
+        if pygame.display.get_surface() is None:
+            self.unconverted.add(key)
+            return surface
+        self.unconverted.discard(key)
+        converted = surface.convert_alpha() if key[2] else surface.convert()
+        self._store(key, converted)
+        return converted
+
+    def _store(self, key, surface):
+        size = surface_bytes(surface)
+        self.resident_bytes += size - self.sizes.get(key, 0)
+        self.sizes[key] = size
+        self.entries[key] = surface
+        self.entries.move_to_end(key)
+        # Never evict the image that is being handed out
+        while self.resident_bytes > self.budget_bytes and len(self.entries) > 1:
+            self._evict()
+
+    def evict(self):
+        """Drop the least recently used image."""
+        with self.lock:
+            self._evict()
+
+    def _evict(self):
+        key, _ = self.entries.popitem(last=False)
+        self.resident_bytes -= self.sizes.pop(key)
+        self.unconverted.discard(key)
+        self.evictions += 1
+
+    def clear(self):
+        """Drop every cached image."""
+        with self.lock:
+            self.entries.clear()
+            self.sizes.clear()
+            self.unconverted.clear()
+            self.resident_bytes = 0
+
+    def stats(self):
+        """
+        Report cache statistics.
+
+        Returns:
+            dict: hits, misses, evictions, entries, resident_bytes and
+            budget_bytes.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "resident_bytes": self.resident_bytes,
+            "budget_bytes": self.budget_bytes,
+        }
+
+
+# Shared by the launcher and every game
+assets = AssetManager()
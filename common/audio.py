@@ -0,0 +1,265 @@
+"""
+Sound effects and music for the launcher and the games.
+
+The shared ``audio`` manager keeps every effect decoded once and plays it
+on a fixed pool of mixer channels. Effects are registered by name with a
+priority:
+
+    audio.register("pickup", path, priority=1, max_voices=3)
+    audio.play("pickup")
+
+play() only puts a request on a queue, so the frame loop never waits on
+the mixer. A background thread takes the requests a burst at a time:
+repeats of one effect within a burst are played once, higher priorities
+go first, and when every channel is busy the oldest voice of a lower or
+equal priority is stolen; otherwise the request is dropped. An effect
+also never holds more than ``max_voices`` channels, so twenty star
+pickups in one frame cannot drown out everything else.
+
+Music is streamed from disk by ``pygame.mixer.music`` rather than decoded
+into memory, and follow-up tracks can be queued behind it.
+
+Without a mixer (no audio device, headless runs) or with
+settings.SOUND_ENABLED off, every call is a no-op.
+"""
+import os
+import queue
+import threading
+
+import pygame
+
+from .loader import loader
+from .settings import AUDIO_CHANNELS, MUSIC_VOLUME, SFX_VOLUME, SOUND_ENABLED
+
+
+class Effect:
+    """A registered sound effect."""
+
+    __slots__ = ("name", "sound", "priority", "max_voices", "volume")
+
+    def __init__(self, name, sound, priority, max_voices, volume):
+        self.name = name
+        self.sound = sound
+        self.priority = priority
+        self.max_voices = max_voices
+        self.volume = volume
+
+
+class AudioManager:
+    """Plays effects on pooled channels and streams music."""
+
+    def __init__(self, enabled=SOUND_ENABLED, channels=AUDIO_CHANNELS, sfx_volume=SFX_VOLUME,
+                 music_volume=MUSIC_VOLUME):
+        """
+        Initialize the manager. The mixer is set up on first use.
+
+        Args:
+            enabled (bool): Whether to make any sound at all.
+            channels (int): Size of the channel pool for effects.
+            sfx_volume (float): Volume of every effect, 0.0 to 1.0.
+            music_volume (float): Volume of the music, 0.0 to 1.0.
+        """
+        self.enabled = enabled
+        self.channel_count = channels
+        self.sfx_volume = sfx_volume
+        self.music_volume = music_volume
+        self.effects = {}
+        self.requests = queue.Queue()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.channels = []
+        # Per channel: (priority, serial, effect name) of its latest voice
+        self.voices = []
+        self.serial = 0
+        self.played = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    @property
+    def active(self):
+        """Whether sound is enabled and a mixer is available."""
+        return self.enabled and pygame.mixer.get_init() is not None
+
+    def register(self, name, path, priority=0, max_voices=2, volume=1.0):
+        """
+        Make an effect playable by name and start decoding it.
+
+        A missing file is skipped silently, so a game can ship without
+        some or all of its sounds.
+
+        Args:
+            name (str): The name passed to play().
+            path (str): The sound file.
+            priority (int): Higher priorities are played first and may
+                steal channels from lower ones.
+            max_voices (int): Most channels the effect may hold at once.
+            volume (float): The effect's volume relative to SFX_VOLUME.
+
+        Returns:
+            concurrent.futures.Future: The decode, or None when the file
+            does not exist.
+        """
+        if not os.path.isfile(path):
+            return None
+        future = loader.sound(path)
+        self.effects[name] = Effect(name, future, priority, max_voices, volume)
+        return future
+
+    def play(self, name, volume=1.0):
+        """
+        Queue an effect to be played; unknown names are ignored.
+
+        Args:
+            name (str): A registered effect.
+            volume (float): Volume relative to the effect's own.
+        """
+        if name in self.effects and self.active:
+            self._send(("play", name, volume))
+
+    def play_music(self, path, loops=-1, fade_ms=500):
+        """
+        Start streaming a music track, replacing the current one.
+
+        Args:
+            path (str): The music file.
+            loops (int): Extra repeats; -1 loops forever.
+            fade_ms (int): Fade-in time in milliseconds.
+        """
+        if self.active:
+            self._send(("music", path, loops, fade_ms))
+
+    def queue_music(self, path):
+        """Queue a track to start when the current one ends."""
+        if self.active:
+            self._send(("queue", path))
+
+    def stop_music(self, fade_ms=500):
+        """Fade the music out."""
+        if self.active:
+            self._send(("stop", fade_ms))
+
+    def set_volume(self, sfx=None, music=None):
+        """
+        Change the effect and/or music volume.
+
+        Args:
+            sfx (float): The new effect volume; unchanged when None.
+            music (float): The new music volume; unchanged when None.
+        """
+        if sfx is not None:
+            self.sfx_volume = sfx
+        if music is not None:
+            self.music_volume = music
+            if self.active:
+                self._send(("volume",))
+
+    def _send(self, request):
+        if self.thread is None:
+            with self.lock:
+                if self.thread is None:
+                    self.thread = threading.Thread(target=self._run, name="audio", daemon=True)
+                    self.thread.start()
+        self.requests.put(request)
+
+    def _run(self):
+        requests = self.requests
+        while True:
+            batch = [requests.get()]
+            # Take the whole burst, e.g. every pickup of one frame
+            try:
+                while True:
+                    batch.append(requests.get_nowait())
+            except queue.Empty:
+                pass
+            if None in batch:
+                return
+            try:
+                self._dispatch(batch)
+            except pygame.error as e:
+                print(f"[AUDIO] {e}")
+
+    def _dispatch(self, batch):
+        if not self.channels:
+            # Keep channels other code may have reserved out of the pool
+            first = pygame.mixer.get_num_channels()
+            pygame.mixer.set_num_channels(first + self.channel_count)
+            self.channels = [pygame.mixer.Channel(first + i) for i in range(self.channel_count)]
+            self.voices = [None] * self.channel_count
+
+        plays = {}
+        for request in batch:
+            kind = request[0]
+            if kind == "play":
+                _, name, volume = request
+                plays[name] = max(volume, plays.get(name, 0.0))
+            elif kind == "music":
+                _, path, loops, fade_ms = request
+                try:
+                    pygame.mixer.music.load(path)
+                except (pygame.error, FileNotFoundError) as e:
+                    print(f"Error loading music {path}: {e}")
+                    continue
+                pygame.mixer.music.set_volume(self.music_volume)
+                pygame.mixer.music.play(loops, fade_ms=fade_ms)
+            elif kind == "queue":
+                pygame.mixer.music.queue(request[1])
+            elif kind == "stop":
+                pygame.mixer.music.fadeout(request[1])
+            elif kind == "volume":
+                pygame.mixer.music.set_volume(self.music_volume)
+
+        effects = sorted((self.effects[name] for name in plays), key=lambda effect: -effect.priority)
+        for effect in effects:
+            self._play(effect, plays[effect.name])
+
+    def _play(self, effect, volume):
+        sound = effect.sound.result()
+        if sound is None:
+            return
+        index = self._channel_for(effect)
+        if index is None:
+            self.dropped += 1
+            return
+        channel = self.channels[index]
+        channel.set_volume(self.sfx_volume * effect.volume * volume)
+        channel.play(sound)
+        self.serial += 1
+        self.voices[index] = (effect.priority, self.serial, effect.name)
+        self.played += 1
+
+    def _channel_for(self, effect):
+        free = None
+        own = []
+        victim = None
+        for i, channel in enumerate(self.channels):
+            voice = self.voices[i]
+            if voice is None or not channel.get_busy():
+                if free is None:
+                    free = i
+                continue
+            if voice[2] == effect.name:
+                own.append(i)
+            elif voice[0] <= effect.priority and (victim is None or voice[:2] < self.voices[victim][:2]):
+                victim = i
+        if len(own) >= effect.max_voices:
+            # Restart the effect's oldest voice rather than stack another
+            self.stolen += 1
+            return min(own, key=lambda i: self.voices[i][1])
+        if free is not None:
+            return free
+        if victim is not None:
+            self.stolen += 1
+        return victim
+
+    def shutdown(self):
+        """Stop the dispatch thread and the music."""
+        if self.thread is not None:
+            self.requests.put(None)
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        if pygame.mixer.get_init():
+            pygame.mixer.music.stop()
+
+
+# Shared by the launcher and every game
+audio = AudioManager()
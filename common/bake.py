@@ -0,0 +1,165 @@
+"""
+On-disk cache of decoded, pre-scaled images.
+
+Decoding a PNG and rescaling it to the window size is most of the time
+between launching a game and its first frame on slow machines. A baked
+blob stores the finished pixels raw, so loading it is a memory map and a
+``pygame.image.frombuffer`` call.
+
+Blobs live in the ``.cache`` directory of the asset's ``assets`` folder
+(see ``settings.get_cache_dir``) and are named after the source file, a
+hash of its contents and the target size. Editing the source changes the
+hash, so the stale blob is simply not found, rebuilt and replaced.
+
+Bake ahead of time with::
+
+    python -m common.bake --size 800x600
+"""
+import argparse
+import glob
+import hashlib
+import mmap
+import os
+import struct
+
+import pygame
+
+from .settings import BASE_DIR, SCREEN_HEIGHT, SCREEN_WIDTH, get_cache_dir
+
+MAGIC = b"ABK1"
+HEADER = struct.Struct("<4sII4s")
+
+_tobytes = getattr(pygame.image, "tobytes", None) or pygame.image.tostring
+
+
+def source_hash(path):
+    """Return a short hash of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def blob_path(path, size, alpha, digest=None):
+    """
+    Get the blob file for a source image at a target size.
+
+    Args:
+        path (str): The source image.
+        size (tuple): The (width, height) the image is scaled to.
+        alpha (bool): Whether per-pixel alpha is kept.
+        digest (str): The source hash, computed if not given.
+
+    Returns:
+        str: The path of the blob.
+    """
+    if digest is None:
+        digest = source_hash(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    fmt = "rgba" if alpha else "rgb"
+    name = f"{stem}.{digest}.{size[0]}x{size[1]}.{fmt}"
+    return os.path.join(get_cache_dir(path), name)
+
+
+def read_blob(blob):
+    """
+    Map a blob into a surface without copying its pixels.
+
+    Returns:
+        pygame.Surface: The image, or None if the blob is missing or corrupt.
+    """
+    try:
+        with open(blob, "rb") as f:
+            # Copy-on-write, so writes to the surface never reach the file
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError):
+        return None
+
+    if len(mapped) < HEADER.size:
+        return None
+    magic, width, height, fmt = HEADER.unpack_from(mapped)
+    fmt = fmt.rstrip(b"\0").decode("ascii", "replace")
+    if magic != MAGIC or fmt not in ("RGB", "RGBA"):
+        return None
+    if len(mapped) - HEADER.size != width * height * len(fmt):
+        return None
+    return pygame.image.frombuffer(memoryview(mapped)[HEADER.size:], (width, height), fmt)
+
+
+def write_blob(blob, surface, alpha):
+    """Write a surface to a blob atomically."""
+    fmt = "RGBA" if alpha else "RGB"
+    width, height = surface.get_size()
+    os.makedirs(os.path.dirname(blob), exist_ok=True)
+    tmp = f"{blob}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, width, height, fmt.encode("ascii")))
+        f.write(_tobytes(surface, fmt))
+    os.replace(tmp, blob)
+
+
+def remove_stale(blob):
+    """Delete blobs of the same source and size baked from older contents."""
+    directory = os.path.dirname(blob)
+    stem, _, size, fmt = os.path.basename(blob).rsplit(".", 3)
+    for other in glob.glob(os.path.join(glob.escape(directory), f"{glob.escape(stem)}.*.{size}.{fmt}")):
+        if other != blob:
+            try:
+                os.remove(other)
+            except OSError:
+                pass
+
+
+def load_scaled(path, size, alpha, build):
+    """
+    Load a pre-scaled image through the bake cache.
+
+    Args:
+        path (str): The source image.
+        size (tuple): The (width, height) target size.
+        alpha (bool): Whether per-pixel alpha is kept.
+        build (callable): Called with no arguments on a cache miss; returns
+            the decoded, scaled surface to bake.
+
+    Returns:
+        pygame.Surface: The image, not display-converted.
+    """
+    try:
+        blob = blob_path(path, size, alpha)
+    except OSError:
+        return build()
+
+    surface = read_blob(blob)
+    if surface is not None:
+        return surface
+
+    surface = build()
+    if surface.get_size() == tuple(size):
+        try:
+            write_blob(blob, surface, alpha)
+            remove_stale(blob)
+        except OSError as e:
+            print(f"Could not bake {path}: {e}")
+    return surface
+
+
+def main():
+    from .assets import AssetManager
+
+    parser = argparse.ArgumentParser(description="Bake pre-scaled images into the asset caches.")
+    parser.add_argument("paths", nargs="*", help="images to bake (default: every game background)")
+    parser.add_argument("--size", default=f"{SCREEN_WIDTH}x{SCREEN_HEIGHT}", help="target size, WIDTHxHEIGHT")
+    parser.add_argument("--alpha", action="store_true", help="keep per-pixel alpha")
+    args = parser.parse_args()
+
+    size = tuple(int(n) for n in args.size.lower().split("x"))
+    paths = args.paths or sorted(glob.glob(os.path.join(BASE_DIR, "games", "*", "assets", "images", "*.png")))
+    manager = AssetManager()
+    for path in paths:
+        manager.load(*manager.key(path, size, args.alpha))
+        print(f"baked {path} at {size[0]}x{size[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Broad-phase collision detection shared by the games.
+"""
+import pygame
+
+
+class SpatialHash:
+    """
+    A uniform-grid spatial hash of axis-aligned rectangles.
+
+    Each entry is stored under a caller-chosen hashable key in every grid
+    cell its rectangle touches, so a query only looks at entries in the
+    cells around the query rectangle. Cost therefore scales with how
+    crowded that neighbourhood is rather than with the total entry count.
+    Results are deterministic: the same sequence of calls always returns
+    the same keys in the same order (see query()).
+    """
+
+    def __init__(self, cell_size=64):
+        """
+        Initialize an empty grid.
+
+        Args:
+            cell_size (int): Width and height of a grid cell in pixels.
+                Roughly the size of a typical entity works best.
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+        self.rects = {}
+        self.spans = {}
+        self.seen = set()
+        self.pair_hits = []  # reused by query_pairs()
+
+    def __len__(self):
+        return len(self.rects)
+
+    def __contains__(self, key):
+        return key in self.rects
+
+    def _span(self, rect):
+        size = self.cell_size
+        left = rect.left // size
+        top = rect.top // size
+        right = max(left, (rect.right - 1) // size)
+        bottom = max(top, (rect.bottom - 1) // size)
+        return (left, top, right, bottom)
+
+    def _add(self, key, span):
+        cells = self.cells
+        for cx in range(span[0], span[2] + 1):
+            for cy in range(span[1], span[3] + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    bucket = cells[(cx, cy)] = {}
+                bucket[key] = None
+
+    def _discard(self, key, span):
+        cells = self.cells
+        for cx in range(span[0], span[2] + 1):
+            for cy in range(span[1], span[3] + 1):
+                bucket = cells[(cx, cy)]
+                del bucket[key]
+                if not bucket:
+                    del cells[(cx, cy)]
+
+    def insert(self, key, rect):
+        """
+        Add an entry to the grid.
+
+        Args:
+            key: A hashable identifier for the entry.
+            rect: A pygame.Rect, kept by reference, or any rect-style
+                sequence, which is copied into a new Rect.
+        """
+        if key in self.rects:
+            raise KeyError(f"{key!r} is already in the grid")
+        if not isinstance(rect, pygame.Rect):
+            rect = pygame.Rect(rect)
+        span = self._span(rect)
+        self.rects[key] = rect
+        self.spans[key] = span
+        self._add(key, span)
+
+    def move(self, key, rect=None):
+        """
+        Re-bucket an entry after its rectangle changed.
+
+        Args:
+            key: The identifier passed to insert().
+            rect: The new rectangle. Omit it when the Rect given to
+                insert() was moved in place.
+        """
+        stored = self.rects[key]
+        if rect is not None and rect is not stored:
+            stored.update(rect)
+        span = self._span(stored)
+        old = self.spans[key]
+        if span != old:
+            self._discard(key, old)
+            self._add(key, span)
+            self.spans[key] = span
+
+    def remove(self, key):
+        """Remove an entry from the grid."""
+        self._discard(key, self.spans.pop(key))
+        del self.rects[key]
+
+    def clear(self):
+        """Remove every entry."""
+        self.cells.clear()
+        self.rects.clear()
+        self.spans.clear()
+
+    def query(self, rect, out=None):
+        """
+        Find the entries whose rectangles overlap rect.
+
+        Args:
+            rect (pygame.Rect): The rectangle to test.
+            out (list): A list to clear and fill instead of allocating a
+                new one, for queries made every frame.
+
+        Returns:
+            list: Keys of the overlapping entries, in the order of the
+            cells visited (column by column) and within a cell in the order
+            entries came into it. This is not insertion order overall.
+        """
+        left, top, right, bottom = self._span(rect)
+        cells = self.cells
+        rects = self.rects
+        seen = self.seen
+        if out is None:
+            hits = []
+        else:
+            hits = out
+            hits.clear()
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for key in bucket:
+                    if key not in seen:
+                        seen.add(key)
+                        if rects[key].colliderect(rect):
+                            hits.append(key)
+        seen.clear()
+        return hits
+
+    def query_pairs(self, queries, out=None):
+        """
+        Run many queries at once.
+
+        Args:
+            queries: An iterable of (query_key, rect) pairs.
+            out (list): A list to clear and fill instead of allocating a
+                new one, for queries made every frame.
+
+        Returns:
+            list: (query_key, key) for every overlapping pair, grouped by
+            query in the order given and each in query() order. An entry
+            is never paired with itself when it is queried with its own key.
+        """
+        if out is None:
+            pairs = []
+        else:
+            pairs = out
+            pairs.clear()
+        hits = self.pair_hits
+        for query_key, rect in queries:
+            for key in self.query(rect, hits):
+                if key != query_key:
+                    pairs.append((query_key, key))
+        return pairs
@@ -0,0 +1,173 @@
+"""
+Dirty-rectangle rendering for scenes where little of the screen moves.
+
+Instead of repainting the whole background and flipping every frame, a
+scene draws through a ``DirtyRenderer``:
+
+    dirty.restore(surface, background)   # paint over last frame's sprites
+    dirty.add(surface.blit(sprite, pos))  # record what this frame draws
+    dirty.present(ctx)                    # update only the changed areas
+
+Every area drawn in the previous frame is restored from the cached
+background, and the union of the previous and current areas is pushed to
+the display with ``pygame.display.update()``. When the merged area grows
+past a fraction of the screen, one full flip is cheaper than many small
+updates and the renderer falls back to it for that frame.
+
+``FullRenderer`` has the same interface and repaints everything, so a
+scene's render code is the same in both modes; ``make_renderer()`` picks
+one according to settings.DIRTY_RECTS.
+"""
+from .settings import DIRTY_FULL_THRESHOLD, DIRTY_RECTS
+
+
+def merge_rects(rects):
+    """
+    Merge overlapping rectangles.
+
+    Args:
+        rects: pygame.Rects; they are not modified.
+
+    Returns:
+        list: Rects covering the same area, none of which overlap.
+    """
+    merged = []
+    for rect in rects:
+        rect = rect.copy()
+        i = rect.collidelist(merged)
+        while i != -1:
+            rect.union_ip(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class DirtyRenderer:
+    """Tracks the areas a scene draws so only those are repainted."""
+
+    def __init__(self, threshold=DIRTY_FULL_THRESHOLD, max_rects=64):
+        """
+        Initialize the renderer. The first frame is always a full one.
+
+        Args:
+            threshold (float): Fraction of the screen area above which a
+                frame is presented with a full flip instead.
+            max_rects (int): Past this many rects per frame, merging and
+                restoring them one by one costs more than a full repaint.
+        """
+        self.threshold = threshold
+        self.max_rects = max_rects
+        self.background = None
+        self.bounds = None
+        self.limit = 0
+        self.previous = []
+        self.previous_area = 0
+        self.current = []
+        self.area = 0
+        self.full = True
+        self.full_frames = 0
+        self.partial_frames = 0
+
+    def invalidate(self):
+        """Repaint and present the whole screen next frame, e.g. after an expose."""
+        self.full = True
+
+    def restore(self, surface, background):
+        """
+        Start a frame: paint the background over last frame's drawing.
+
+        Args:
+            surface (pygame.Surface): The scene surface.
+            background (pygame.Surface): The static backdrop, the size of
+                surface. Passing a different surface repaints it all.
+        """
+        if background is not self.background:
+            self.background = background
+            self.full = True
+        self.bounds = surface.get_rect()
+        self.limit = self.threshold * self.bounds.w * self.bounds.h
+        if self.full or self._crowded(self.previous, self.previous_area):
+            surface.blit(background, (0, 0))
+        else:
+            for rect in self.previous:
+                surface.blit(background, rect, rect)
+        self.current = []
+        self.area = 0
+
+    def _crowded(self, rects, area):
+        return len(rects) > self.max_rects or area > self.limit
+
+    def add(self, rect):
+        """
+        Record an area drawn this frame.
+
+        Args:
+            rect (pygame.Rect): What blit(), fill() or pygame.draw returned;
+                None is ignored.
+
+        Returns:
+            pygame.Rect: rect, so calls can be chained.
+        """
+        if rect:
+            clipped = rect.clip(self.bounds)
+            if clipped:
+                self.current.append(clipped)
+                self.area += clipped.w * clipped.h
+        return rect
+
+    def present(self, ctx):
+        """
+        Show the frame, updating only the dirty areas when that pays off.
+
+        Args:
+            ctx (Runtime): The display context. Partial updates need a
+                software window showing the scene 1:1 or at a whole-number
+                scale; other scenes are presented in full, and a GPU one
+                repainted in full.
+        """
+        current = self.current
+        if (self.full or not ctx.partial_updates
+                or self._crowded(current, self.area)
+                or self._crowded(self.previous, self.previous_area)):
+            full = True
+        else:
+            # The summed areas above over-count overlaps; check again merged
+            rects = merge_rects(self.previous + current)
+            full = sum(rect.w * rect.h for rect in rects) > self.limit
+
+        if full:
+            ctx.present()
+            self.full_frames += 1
+        else:
+            ctx.present(rects)
+            self.partial_frames += 1
+        self.previous = current
+        self.previous_area = self.area
+        self.current = []
+        self.area = 0
+        # A canvas that forgets its pixels needs the whole background again
+        self.full = not ctx.retained
+
+
+class FullRenderer:
+    """Repaints and flips the whole screen every frame."""
+
+    def invalidate(self):
+        pass
+
+    def restore(self, surface, background):
+        surface.blit(background, (0, 0))
+
+    def add(self, rect):
+        return rect
+
+    def present(self, ctx):
+        ctx.present()
+
+
+FULL_RENDERER = FullRenderer()
+
+
+def make_renderer(enabled=DIRTY_RECTS):
+    """Return a new DirtyRenderer if enabled, otherwise the shared FullRenderer."""
+    return DirtyRenderer() if enabled else FULL_RENDERER
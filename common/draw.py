@@ -0,0 +1,24 @@
+"""
+Drawing primitives for either rendering backend.
+
+Same signatures and return values as their ``pygame.draw`` namesakes;
+they draw on a pygame.Surface with pygame.draw, or on a
+``common.gpu.GPUCanvas`` with the GPU. Scenes use these instead of
+pygame.draw for anything drawn onto the surface Runtime.begin() returns.
+Offscreen sprites can keep using pygame.draw directly.
+"""
+import pygame
+
+
+def rect(surface, color, rect, width=0, border_radius=0):
+    """Draw a rectangle; see pygame.draw.rect()."""
+    if isinstance(surface, pygame.Surface):
+        return pygame.draw.rect(surface, color, rect, width, border_radius)
+    return surface.draw_rect(color, rect, width, border_radius)
+
+
+def line(surface, color, start_pos, end_pos, width=1):
+    """Draw a straight line; see pygame.draw.line()."""
+    if isinstance(surface, pygame.Surface):
+        return pygame.draw.line(surface, color, start_pos, end_pos, width)
+    return surface.draw_line(color, start_pos, end_pos, width)
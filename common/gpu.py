@@ -0,0 +1,210 @@
+"""
+Hardware-accelerated drawing through SDL's 2D renderer.
+
+With ``settings.RENDER_BACKEND = "gpu"`` (ARENA_RENDERER=gpu) the Runtime
+draws scenes with ``pygame._sdl2.video`` instead of blitting on the CPU.
+``Runtime.begin()`` then returns a ``GPUCanvas`` rather than a Surface.
+It has the Surface methods scenes draw with (blit, blits, fill,
+get_rect, ...), and ``common.draw`` provides the rect and line
+primitives for both backends, so render code is the same either way.
+
+Every Surface blitted onto a canvas is uploaded to a texture once, on
+first use, and drawn by the GPU from then on. That suits the images,
+sprite frames and cached text the scenes draw. A surface that is changed
+after it was drawn must be passed to ``forget()``, or the stale texture
+keeps being shown.
+
+Scaling a scene to the window is done by the renderer's logical size, so
+no frame is ever scaled on the CPU. Unlike a Surface, the canvas does
+not keep its pixels between frames: every frame must be drawn in full
+(``Runtime.retained`` is False).
+"""
+import os
+from collections import OrderedDict
+
+import pygame
+
+
+class TextureCache:
+    """Textures of the surfaces drawn with one renderer, least recently used first."""
+
+    def __init__(self, renderer, max_entries=1024):
+        """
+        Initialize the cache.
+
+        Args:
+            renderer (pygame._sdl2.video.Renderer): The renderer textures
+                are created for.
+            max_entries (int): Most textures kept; each holds a reference
+                to its surface so the key stays valid.
+        """
+        self.renderer = renderer
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.uploads = 0
+
+    def get(self, surface):
+        """Return the texture of a surface, uploading it on first use."""
+        from pygame._sdl2.video import Texture
+
+        key = id(surface)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry[1]
+        # SDL carries the surface's alpha and blend settings over
+        texture = Texture.from_surface(self.renderer, surface)
+        self.entries[key] = (surface, texture)
+        self.uploads += 1
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return texture
+
+    def forget(self, surface):
+        """Drop a surface's texture so its new contents are uploaded."""
+        self.entries.pop(id(surface), None)
+
+    def clear(self):
+        self.entries.clear()
+
+
+class GPUCanvas:
+    """A Surface-like drawing target backed by an SDL renderer."""
+
+    def __init__(self, renderer, size, textures=None):
+        """
+        Initialize the canvas.
+
+        Args:
+            renderer (pygame._sdl2.video.Renderer): The window's renderer.
+            size (tuple): The logical size scenes draw at.
+            textures (TextureCache): Shared with the other canvases of the
+                renderer; a new one when omitted.
+        """
+        self.renderer = renderer
+        self.size = tuple(size)
+        self.bounds = pygame.Rect((0, 0), self.size)
+        self.textures = textures or TextureCache(renderer)
+
+    def get_size(self):
+        return self.size
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    def get_rect(self, **kwargs):
+        rect = self.bounds.copy()
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+    def forget(self, surface):
+        """Re-upload a surface on its next blit, after it was modified."""
+        self.textures.forget(surface)
+
+    def _color(self, color):
+        self.renderer.draw_color = pygame.Color(color)
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        """
+        Draw a surface, like Surface.blit(). special_flags are ignored.
+
+        Returns:
+            pygame.Rect: The area drawn to.
+        """
+        if area is None:
+            rect = pygame.Rect(dest[0], dest[1], source.get_width(), source.get_height())
+        else:
+            area = pygame.Rect(area)
+            rect = pygame.Rect(dest[0], dest[1], area.width, area.height)
+        self.textures.get(source).draw(area, rect)
+        return rect.clip(self.bounds)
+
+    def blits(self, blit_sequence, doreturn=True):
+        """Draw many surfaces, like Surface.blits()."""
+        rects = [self.blit(*item) for item in blit_sequence]
+        return rects if doreturn else None
+
+    def fill(self, color, rect=None, special_flags=0):
+        """
+        Fill an area with a solid color, like Surface.fill().
+
+        Returns:
+            pygame.Rect: The area filled.
+        """
+        self._color(color)
+        rect = self.bounds if rect is None else pygame.Rect(rect)
+        self.renderer.fill_rect(rect)
+        return rect.clip(self.bounds)
+
+    def draw_rect(self, color, rect, width=0, border_radius=0):
+        """
+        Draw a rectangle like pygame.draw.rect(); corners are never rounded.
+
+        Returns:
+            pygame.Rect: The area drawn to.
+        """
+        rect = pygame.Rect(rect)
+        self._color(color)
+        if width <= 0:
+            self.renderer.fill_rect(rect)
+        else:
+            for i in range(min(width, (min(rect.size) + 1) // 2)):
+                self.renderer.draw_rect(rect.inflate(-2 * i, -2 * i))
+        return rect.clip(self.bounds)
+
+    def draw_line(self, color, start, end, width=1):
+        """
+        Draw a line like pygame.draw.line(); thick lines are drawn as
+        parallel one-pixel lines.
+
+        Returns:
+            pygame.Rect: The area drawn to.
+        """
+        self._color(color)
+        (x1, y1), (x2, y2) = start, end
+        offsets = range(-(width // 2), width - width // 2) if width > 1 else (0,)
+        horizontal = abs(x2 - x1) >= abs(y2 - y1)
+        for offset in offsets:
+            if horizontal:
+                self.renderer.draw_line((x1, y1 + offset), (x2, y2 + offset))
+            else:
+                self.renderer.draw_line((x1 + offset, y1), (x2 + offset, y2))
+        spread = len(offsets) - 1
+        rect = pygame.Rect(min(x1, x2), min(y1, y2), abs(x2 - x1) + 1, abs(y2 - y1) + 1)
+        rect.inflate_ip(0 if horizontal else spread, spread if horizontal else 0)
+        return rect.clip(self.bounds)
+
+
+def open_renderer(size, caption, fullscreen=False, smooth=False):
+    """
+    Open a window drawn by SDL's accelerated renderer.
+
+    A hidden 1x1 display-module window is opened as well, so that
+    Surface.convert() and the asset cache keep working; SDL refuses a
+    renderer on the display module's own window.
+
+    Args:
+        size (tuple): The window size.
+        caption (str): The window title.
+        fullscreen (bool): Cover the whole desktop instead.
+        smooth (bool): Filter textures when scaling them rather than
+            using the nearest pixel.
+
+    Returns:
+        tuple: (pygame._sdl2.video.Window, Renderer).
+
+    Raises:
+        ImportError: If pygame was built without SDL2 video support.
+        pygame.error: If no renderer can be created.
+    """
+    from pygame._sdl2.video import Renderer, Window
+
+    # Read by SDL whenever a texture is created
+    os.environ["SDL_RENDER_SCALE_QUALITY"] = "linear" if smooth else "nearest"
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    window = Window(caption, size, resizable=True, fullscreen_desktop=fullscreen)
+    return window, Renderer(window)
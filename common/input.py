@@ -0,0 +1,135 @@
+"""
+Per-frame input for the launcher and the games.
+
+The FrameScheduler already drains the event queue once per frame.
+``InputReader.poll()`` folds those events into one immutable
+``InputSnapshot``: the held actions as an ACTION_* bitmask, the keys
+pressed this frame in order, and the mouse. However many motion events
+arrived, the snapshot carries only the latest pointer position, so hover
+logic runs once per frame instead of once per event. Mouse positions are
+already mapped to the scene's logical coordinates.
+
+Window housekeeping is handled while polling: resizes are passed to the
+Runtime and the profiler gets its hotkeys first. The snapshot only
+reports that they happened.
+
+``HitIndex`` finds the widget under a point through a spatial hash of
+the widgets' rects, built once when the widgets are laid out.
+"""
+from collections import namedtuple
+
+import pygame
+
+from .collision import SpatialHash
+from .profiler import profiler
+from .simulation import read_inputs
+
+InputSnapshot = namedtuple("InputSnapshot", (
+    "actions",  # held ACTION_* bits, the value step() consumes
+    "keys",     # tuple of keys pressed this frame, in order
+    "mouse",    # logical pointer position if it moved this frame, else None
+    "clicks",   # tuple of logical positions of left clicks, in order
+    "quit",     # the window was closed
+    "resized",  # the window changed size; the scene surface may be new
+    "exposed",  # the window contents were lost and must be redrawn
+))
+
+
+class InputReader:
+    """Turns each frame's events into an InputSnapshot."""
+
+    def __init__(self, ctx=None):
+        """
+        Initialize the reader.
+
+        Args:
+            ctx (Runtime): Maps mouse positions to scene coordinates and
+                follows window resizes; positions are left as they are
+                when omitted.
+        """
+        self.ctx = ctx
+
+    def poll(self, events):
+        """
+        Read one frame of input.
+
+        Args:
+            events (list): The frame's events, from FrameScheduler.wait().
+
+        Returns:
+            InputSnapshot: Everything the frame needs to react to.
+        """
+        ctx = self.ctx
+        keys = []
+        clicks = []
+        mouse = None
+        quit = resized = exposed = False
+        for event in events:
+            kind = event.type
+            if kind == pygame.MOUSEMOTION:
+                # Only the last position of the frame matters
+                mouse = event.pos
+            elif kind == pygame.KEYDOWN:
+                if not profiler.handle_event(event):
+                    keys.append(event.key)
+            elif kind == pygame.MOUSEBUTTONDOWN:
+                mouse = event.pos
+                if event.button == 1:
+                    clicks.append(ctx.to_logical(event.pos) if ctx else event.pos)
+            elif kind == pygame.QUIT:
+                quit = True
+            elif kind == pygame.VIDEORESIZE:
+                resized = ctx.handle_event(event) if ctx else True
+            elif kind in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                exposed = True
+        if mouse is not None and ctx is not None:
+            mouse = ctx.to_logical(mouse)
+        return InputSnapshot(read_inputs(pygame.key.get_pressed()), tuple(keys), mouse, tuple(clicks),
+                             quit, resized, exposed)
+
+
+class HitIndex:
+    """Widget rects indexed for finding the widget under the pointer."""
+
+    def __init__(self, cell_size=64):
+        """
+        Initialize an empty index.
+
+        Args:
+            cell_size (int): Grid cell size in pixels; see SpatialHash.
+        """
+        self.grid = SpatialHash(cell_size)
+        self.probe = pygame.Rect(0, 0, 1, 1)
+        self.hits = []
+        # Registration order, to settle overlaps; the grid does not keep it
+        self.order = {}
+
+    def add(self, key, rect):
+        """
+        Register a widget.
+
+        Args:
+            key: What at() returns for the widget, e.g. its index.
+            rect (pygame.Rect): Its area, kept by reference; call move()
+                after changing it.
+        """
+        self.grid.insert(key, rect)
+        self.order[key] = len(self.order)
+
+    def move(self, key):
+        """Re-index a widget whose rect was changed in place."""
+        self.grid.move(key)
+
+    def at(self, pos):
+        """
+        Find the widget at a point.
+
+        Returns:
+            The key of the widget, the first added where widgets overlap,
+            or None.
+        """
+        self.probe.topleft = pos
+        hits = self.grid.query(self.probe, self.hits)
+        if not hits:
+            return None
+        return hits[0] if len(hits) == 1 else min(hits, key=self.order.__getitem__)
@@ -0,0 +1,183 @@
+"""
+Background asset streaming.
+
+The shared ``loader`` decodes images, sounds and fonts on a small thread
+pool and hands back ``concurrent.futures.Future`` objects, so a screen can
+keep drawing while a game's assets load. pygame releases the GIL while it
+decodes an image, so the workers really do run in parallel with the main
+loop.
+
+Decoded images go into the shared AssetManager unconverted: converting
+to the display format must happen on the main thread, which
+``finalize()`` does a few surfaces at a time. An image() lookup made
+while its file is still being decoded waits for that decode instead of
+starting a second one.
+
+``progress()`` reports the fraction of the requests made since
+``begin_batch()`` that have finished, for a loading bar.
+"""
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pygame
+
+from .assets import assets
+from .settings import LOADER_WORKERS
+from .text import get_font_file
+
+
+def decode_sound(path):
+    """Decode a sound file, or return None without a mixer or on error."""
+    if not pygame.mixer.get_init():
+        return None
+    try:
+        return pygame.mixer.Sound(path)
+    except (pygame.error, FileNotFoundError) as e:
+        print(f"Error loading sound {path}: {e}")
+        return None
+
+
+class AssetLoader:
+    """A thread pool that streams assets in and tracks their progress."""
+
+    def __init__(self, manager=assets, workers=LOADER_WORKERS):
+        """
+        Initialize the loader. Threads are started on first use.
+
+        Args:
+            manager (AssetManager): Where decoded images are cached.
+            workers (int): Number of decode threads.
+        """
+        self.manager = manager
+        self.workers = workers
+        self.executor = None
+        # Reentrant: a done callback runs at once, in the thread that added
+        # it or cancelled the future, when the lock may already be held
+        self.lock = threading.RLock()
+        self.requests = {}
+        self.batch = []
+        # Every request not finished yet, for shutdown() to cancel
+        self.running = set()
+
+    def _start(self, fn, *args):
+        # Called with the lock held
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="assets")
+        future = self.executor.submit(fn, *args)
+        self.batch.append(future)
+        self.running.add(future)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future):
+        # Runs on a worker thread, or at once when the future is already done
+        with self.lock:
+            self.running.discard(future)
+
+    def _submit(self, key, fn, *args):
+        # Sounds and fonts are kept by their futures, so each loads once
+        with self.lock:
+            future = self.requests.get(key)
+            if future is None:
+                future = self.requests[key] = self._start(fn, *args)
+        return future
+
+    def image(self, path, scale=1.0, alpha=True):
+        """
+        Start decoding an image into the AssetManager.
+
+        Args:
+            path (str): The image file.
+            scale: A scale factor, or a (width, height) target size.
+            alpha (bool): Whether the image keeps per-pixel alpha.
+
+        Returns:
+            concurrent.futures.Future: Done once the image is cached; draw
+            it with assets.image() using the same arguments.
+        """
+        manager = self.manager
+        key = manager.key(path, scale, alpha)
+        with self.lock:
+            future = manager.pending.get(key)
+            if future is not None:
+                return future
+            if key in manager:
+                future = Future()
+                future.set_result(None)
+                return future
+            future = manager.pending[key] = self._start(manager.preload, path, scale, alpha)
+        future.add_done_callback(lambda _: manager.pending.pop(key, None))
+        return future
+
+    def sound(self, path):
+        """
+        Start decoding a sound.
+
+        Returns:
+            concurrent.futures.Future: Resolves to a pygame.mixer.Sound, or
+            None when there is no mixer or the file cannot be read.
+        """
+        return self._submit(("sound", os.path.normpath(path)), decode_sound, path)
+
+    def font(self, path, size):
+        """
+        Start loading a font file.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the shared
+            pygame.font.Font.
+        """
+        return self._submit(("font", os.path.normpath(path), size), get_font_file, path, size)
+
+    def begin_batch(self):
+        """Start counting progress afresh, keeping requests still in flight."""
+        with self.lock:
+            self.batch = [future for future in self.batch if not future.done()]
+
+    def progress(self):
+        """
+        Get how far the current batch has come.
+
+        Returns:
+            float: Finished requests over all requests since begin_batch(),
+            1.0 when there are none.
+        """
+        with self.lock:
+            batch = list(self.batch)
+        if not batch:
+            return 1.0
+        return sum(1 for future in batch if future.done()) / len(batch)
+
+    @property
+    def busy(self):
+        """Whether any request of the current batch is still running."""
+        with self.lock:
+            return any(not future.done() for future in self.batch)
+
+    def finalize(self, limit=None):
+        """
+        Convert decoded images to the display format. Main thread only.
+
+        Args:
+            limit (int): Most images to convert in this call, to spread
+                the work over several frames.
+
+        Returns:
+            int: Images still waiting for conversion.
+        """
+        return self.manager.finalize(limit)
+
+    def shutdown(self):
+        """Stop the workers, dropping requests that have not started."""
+        if self.executor is not None:
+            # Executor.shutdown(cancel_futures=True) needs Python 3.9
+            with self.lock:
+                for future in list(self.running):
+                    future.cancel()
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+
+# Shared by the launcher and every game
+loader = AssetLoader()
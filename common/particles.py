@@ -0,0 +1,235 @@
+"""
+Particle effects for the games: bursts, trails and streaks.
+
+A ``ParticleSystem`` holds up to ``capacity`` particles in preallocated
+NumPy arrays, live ones packed at the front like Shadow Ops' EnemyPool,
+so moving, ageing and culling them takes a few vectorized operations per
+frame however many there are. A particle is drawn with its style's
+sprite at the fade step matching its age; each style pre-renders those
+steps once, so drawing a frame is a single Surface.blits() of cached
+surfaces.
+
+The capacity is a hard cap. Once the pool is half full, new particles are
+thinned in proportion to the room left, so a crowded screen degrades to
+sparser effects instead of a slower frame; what still does not fit is
+dropped and counted.
+
+Effects are presentation only. They take their randomness from their own
+generator and never read or change game state, so they cannot affect
+scores or replays.
+"""
+import numpy as np
+import pygame
+
+from .settings import PARTICLE_CAPACITY
+
+# Sprites per style, from fully opaque to nearly transparent
+FADE_STEPS = 8
+
+
+class ParticleStyle:
+    """How one kind of particle looks and moves."""
+
+    def __init__(self, color, radius, life=30, drag=1.0, gravity=0.0):
+        """
+        Initialize the style. Its sprites are rendered on first draw.
+
+        Args:
+            color (tuple): RGB color of the dot.
+            radius (int): Dot radius in pixels.
+            life (float): Ticks a particle lives.
+            drag (float): Velocity kept per tick, 1.0 for none lost.
+            gravity (float): Added to the vertical velocity per tick.
+        """
+        self.color = color
+        self.radius = radius
+        self.life = life
+        self.drag = drag
+        self.gravity = gravity
+        self.frames = None
+
+    def sprites(self):
+        """
+        Get the fade steps, rendering them on first use.
+
+        Returns:
+            list: FADE_STEPS surfaces, oldest-looking last.
+        """
+        if self.frames is None:
+            size = self.radius * 2 + 1
+            dot = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(dot, self.color, (self.radius, self.radius), self.radius)
+            frames = []
+            for i in range(FADE_STEPS):
+                frame = dot.copy()
+                alpha = 255 * (FADE_STEPS - i) // FADE_STEPS
+                frame.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+                if pygame.display.get_surface() is not None:
+                    frame = frame.convert_alpha()
+                frames.append(frame)
+            self.frames = frames
+        return self.frames
+
+
+class ParticleSystem:
+    """A fixed-capacity pool of particles updated and drawn in batches."""
+
+    def __init__(self, capacity=PARTICLE_CAPACITY, seed=None):
+        """
+        Initialize an empty pool.
+
+        Args:
+            capacity (int): Most particles alive at once.
+            seed (int): Seed for the particles' random spread.
+        """
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.vx = np.zeros(capacity, dtype=np.float64)
+        self.vy = np.zeros(capacity, dtype=np.float64)
+        self.age = np.zeros(capacity, dtype=np.float64)
+        self.life = np.ones(capacity, dtype=np.float64)
+        self.drag = np.ones(capacity, dtype=np.float64)
+        self.gravity = np.zeros(capacity, dtype=np.float64)
+        self.style = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.count = 0
+        self.styles = []
+        self.style_ids = {}
+        # Per style id: sprite half size, to center the dots on their points
+        self.offsets = np.zeros(0, dtype=np.float64)
+        self.rng = np.random.default_rng(seed)
+        self.emitted = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return self.count
+
+    def _style_id(self, style):
+        index = self.style_ids.get(style)
+        if index is None:
+            index = self.style_ids[style] = len(self.styles)
+            self.styles.append(style)
+            self.offsets = np.array([s.radius for s in self.styles], dtype=np.float64)
+        return index
+
+    def _room(self, wanted):
+        # How many of the wanted particles to add; see the module docstring
+        free = self.capacity - self.count
+        half = self.capacity // 2
+        n = wanted
+        if self.count > half:
+            n = wanted * free // half
+        n = min(n, free)
+        self.dropped += wanted - n
+        return n
+
+    def _add(self, style, n, x, y, vx, vy):
+        i, j = self.count, self.count + n
+        self.x[i:j] = x
+        self.y[i:j] = y
+        self.vx[i:j] = vx
+        self.vy[i:j] = vy
+        self.age[i:j] = 0.0
+        self.life[i:j] = style.life
+        self.drag[i:j] = style.drag
+        self.gravity[i:j] = style.gravity
+        self.style[i:j] = self._style_id(style)
+        self.count = j
+        self.emitted += n
+
+    def burst(self, style, pos, count, speed=3.0):
+        """
+        Throw particles out from one point in every direction.
+
+        Args:
+            style (ParticleStyle): How the particles look and move.
+            pos (tuple): The (x, y) center of the burst.
+            count (int): Particles wanted; fewer when the pool is busy.
+            speed (float): Top speed in pixels per tick.
+        """
+        n = self._room(count)
+        if n <= 0:
+            return
+        angle = self.rng.uniform(0.0, 2 * np.pi, n)
+        velocity = self.rng.uniform(0.3 * speed, speed, n)
+        self._add(style, n, pos[0], pos[1], np.cos(angle) * velocity, np.sin(angle) * velocity)
+
+    def emit(self, style, xs, ys, jitter=0.0):
+        """
+        Leave one particle at each of many points, e.g. behind every enemy.
+
+        Args:
+            style (ParticleStyle): How the particles look and move.
+            xs: Sequence or array of x coordinates.
+            ys: The matching y coordinates.
+            jitter (float): Top speed of a random drift in pixels per tick.
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        wanted = len(xs)
+        n = self._room(wanted)
+        if n <= 0:
+            return
+        if n < wanted:
+            # Thin the points out evenly rather than keep the first ones
+            keep = np.arange(n) * wanted // n
+            xs, ys = xs[keep], ys[keep]
+        if jitter:
+            vx = self.rng.uniform(-jitter, jitter, n)
+            vy = self.rng.uniform(-jitter, jitter, n)
+        else:
+            vx = vy = 0.0
+        self._add(style, n, xs, ys, vx, vy)
+
+    def update(self, dt=1):
+        """Move and age every particle by dt ticks, dropping expired ones."""
+        n = self.count
+        if not n:
+            return
+        vx, vy = self.vx[:n], self.vy[:n]
+        self.x[:n] += vx * dt
+        self.y[:n] += vy * dt
+        vy += self.gravity[:n] * dt
+        drag = self.drag[:n]
+        if dt == 1:
+            vx *= drag
+            vy *= drag
+        else:
+            keep = drag ** dt
+            vx *= keep
+            vy *= keep
+        age = self.age[:n]
+        age += dt
+        alive = self.alive[:n]
+        np.less(age, self.life[:n], out=alive)
+        live = int(np.count_nonzero(alive))
+        if live == n:
+            return
+        for array in (self.x, self.y, self.vx, self.vy, self.age, self.life, self.drag, self.gravity,
+                      self.style):
+            array[:live] = array[:n][alive]
+        self.count = live
+
+    def draw(self, surface):
+        """
+        Draw every particle in one batch.
+
+        Returns:
+            list: The areas drawn to, one per particle.
+        """
+        n = self.count
+        if not n:
+            return []
+        style = self.style[:n]
+        offsets = self.offsets[style]
+        left = (self.x[:n] - offsets).astype(np.int32).tolist()
+        top = (self.y[:n] - offsets).astype(np.int32).tolist()
+        fade = np.minimum((self.age[:n] * FADE_STEPS / self.life[:n]).astype(np.int32), FADE_STEPS - 1)
+        sprites = [s.sprites() for s in self.styles]
+        return surface.blits([(sprites[s][f], (x, y))
+                              for s, f, x, y in zip(style.tolist(), fade.tolist(), left, top)])
+
+    def clear(self):
+        """Remove every particle, e.g. when a round restarts."""
+        self.count = 0
@@ -0,0 +1,93 @@
+"""
+Object pooling for entities that are created and destroyed during play.
+
+A ``Pool`` hands out preallocated objects and takes them back, so the
+frame loop recycles entities instead of allocating new ones and leaving
+the old ones to the garbage collector. Pooled classes define
+``__slots__`` to stay small, and a ``reset()`` method that re-initializes
+a recycled object in place:
+
+    class Spark:
+        __slots__ = ("x", "y", "life")
+
+        def reset(self, x, y):
+            self.x = x
+            self.y = y
+            self.life = 30
+
+    sparks = Pool(Spark, capacity=64)
+    spark = sparks.acquire(10, 20)
+    ...
+    sparks.release(spark)
+"""
+import gc
+
+
+class Pool:
+    """A free list of reusable objects with acquire/release semantics."""
+
+    def __init__(self, factory, capacity=0, grow=True):
+        """
+        Initialize the pool.
+
+        Args:
+            factory (callable): Creates a blank object; called without
+                arguments. The objects must have a reset(*args) method.
+            capacity (int): Number of objects created up front.
+            grow (bool): Whether acquire() may create more objects when
+                the pool runs dry. Without it, acquire() returns None.
+        """
+        self.factory = factory
+        self.grow = grow
+        self.free = [factory() for _ in range(capacity)]
+        self.created = capacity
+
+    def __len__(self):
+        """Number of objects ready to be acquired."""
+        return len(self.free)
+
+    def acquire(self, *args):
+        """
+        Take an object from the pool and reset it.
+
+        Args:
+            *args: Passed to the object's reset().
+
+        Returns:
+            The object, or None when the pool is empty and may not grow.
+        """
+        if self.free:
+            obj = self.free.pop()
+        elif self.grow:
+            obj = self.factory()
+            self.created += 1
+        else:
+            return None
+        obj.reset(*args)
+        return obj
+
+    def release(self, obj):
+        """Return an object to the pool. Do not use it afterwards."""
+        self.free.append(obj)
+
+    def release_all(self, objs):
+        """Return several objects, e.g. a whole entity list, at once."""
+        self.free.extend(objs)
+
+
+def freeze_heap():
+    """
+    Collect garbage, then exempt every surviving object from future
+    collections.
+
+    Call it once per process, when startup loading is done. Fonts,
+    sprites and pools created up to then are long-lived, and the collector
+    otherwise re-scans all of them on every full collection, which shows
+    up as a frame hitch. Frozen objects are never freed, so calling it
+    again, e.g. on every game launch, would pin each session's garbage.
+
+    gc.freeze() is new in Python 3.7; on 3.6 this only collects.
+    """
+    gc.collect()
+    if hasattr(gc, "freeze"):
+        gc.freeze()
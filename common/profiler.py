@@ -0,0 +1,250 @@
+"""
+Frame-time instrumentation for the launcher and the games.
+
+Wrap each phase of a loop in a named scoped timer and bracket the frame:
+
+    profiler.begin_frame()
+    with profiler.phase("update"):
+        ...
+    with profiler.phase("draw"):
+        ...
+    profiler.end_frame()
+
+While disabled, ``phase()`` hands back one shared do-nothing context
+manager and the frame calls return immediately, so the instrumentation
+can stay in production builds. Enable it with ARENA_PROFILE=1 or toggle
+it at runtime with F3; F4 writes the collected frames to disk.
+"""
+import csv
+import json
+import time
+from collections import deque
+
+import pygame
+
+from .settings import FPS, PROFILE_ENABLED
+from .text import get_font
+
+PERCENTILES = (50, 95, 99)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _PhaseTimer:
+    __slots__ = ("name", "profiler", "start")
+
+    def __init__(self, name, profiler):
+        self.name = name
+        self.profiler = profiler
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = (time.perf_counter() - self.start) * 1000.0
+        current = self.profiler.current
+        current[self.name] = current.get(self.name, 0.0) + elapsed
+        return False
+
+
+def percentile(sorted_values, pct):
+    """Return the pct-th percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Profiler:
+    """Per-phase frame timings over a rolling window of frames."""
+
+    def __init__(self, enabled=False, window=600, target_fps=FPS, drop_factor=1.5):
+        """
+        Initialize the profiler.
+
+        Args:
+            enabled (bool): Whether to record anything.
+            window (int): Number of recent frames kept for the statistics.
+            target_fps (int): The frame rate the loop aims for.
+            drop_factor (float): A frame counts as dropped when the time
+                since the previous one exceeds this many frame budgets.
+        """
+        self.enabled = enabled
+        self.window = window
+        self.budget_ms = 1000.0 / target_fps
+        self.drop_factor = drop_factor
+        self.timers = {}
+        self.frames = deque(maxlen=window)
+        self.current = {}
+        self.frame_start = 0.0
+        self.last_frame_end = None
+        self.frame_count = 0
+        self.dropped = 0
+        self.overlay = None
+        self.overlay_frame = -1
+
+    def reset(self, window=None):
+        """Forget every recorded frame, optionally resizing the window."""
+        if window is not None:
+            self.window = window
+            self.frames = deque(maxlen=window)
+        self.frames.clear()
+        self.current = {}
+        self.last_frame_end = None
+        self.frame_count = 0
+        self.dropped = 0
+        self.overlay = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.reset()
+
+    def phase(self, name):
+        """
+        Get a context manager that times one phase of the current frame.
+
+        Time from repeated uses of the same phase within a frame is added
+        up, e.g. several simulation ticks in one frame.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = _PhaseTimer(name, self)
+        return timer
+
+    def begin_frame(self):
+        if self.enabled:
+            self.current = {}
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        frame = self.current
+        frame["frame"] = (now - self.frame_start) * 1000.0
+        if self.last_frame_end is not None:
+            interval = (now - self.last_frame_end) * 1000.0
+            frame["interval"] = interval
+            if interval > self.budget_ms * self.drop_factor:
+                self.dropped += 1
+        self.last_frame_end = now
+        self.frames.append(frame)
+        self.frame_count += 1
+
+    def phases(self):
+        """Return every phase name seen in the window, in first-seen order."""
+        names = {}
+        for frame in self.frames:
+            for name in frame:
+                names[name] = None
+        return list(names)
+
+    def stats(self):
+        """
+        Summarize the rolling window.
+
+        Returns:
+            dict: For every phase, its p50/p95/p99, mean and max in
+            milliseconds, plus frame and dropped-frame counters.
+        """
+        summary = {}
+        for name in self.phases():
+            values = sorted(frame.get(name, 0.0) for frame in self.frames)
+            entry = {f"p{pct}": percentile(values, pct) for pct in PERCENTILES}
+            entry["mean"] = sum(values) / len(values)
+            entry["max"] = values[-1]
+            summary[name] = entry
+        return {
+            "phases": summary,
+            "frames": self.frame_count,
+            "dropped": self.dropped,
+            "budget_ms": self.budget_ms,
+        }
+
+    def export(self, path):
+        """
+        Write the window to disk for offline analysis.
+
+        A .csv path gets one row per frame and one column per phase; any
+        other path gets JSON with the summary and the per-frame timings.
+        """
+        if path.endswith(".csv"):
+            names = self.phases()
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["index"] + names)
+                first = self.frame_count - len(self.frames)
+                for i, frame in enumerate(self.frames):
+                    writer.writerow([first + i] + [f"{frame.get(name, 0.0):.4f}" for name in names])
+        else:
+            with open(path, "w") as f:
+                json.dump({"summary": self.stats(), "frames": list(self.frames)}, f, indent=1)
+        return path
+
+    def handle_event(self, event):
+        """Handle the profiler hotkeys: F3 toggles, F4 exports."""
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == pygame.K_F3:
+            self.toggle()
+            return True
+        if event.key == pygame.K_F4 and self.enabled:
+            path = self.export(time.strftime("profile-%Y%m%d-%H%M%S.json"))
+            print(f"[PROFILER] Wrote {path}")
+            return True
+        return False
+
+    def draw_overlay(self, surface, refresh=30):
+        """
+        Draw the statistics panel in the top-right corner.
+
+        The panel is only re-rendered every ``refresh`` frames; in between
+        it is a single blit.
+
+        Returns:
+            pygame.Rect: The area drawn to, or None while disabled.
+        """
+        if not self.enabled:
+            return None
+        if self.overlay is None or self.frame_count - self.overlay_frame >= refresh:
+            self.overlay = self._render_overlay()
+            self.overlay_frame = self.frame_count
+        return surface.blit(self.overlay, (surface.get_width() - self.overlay.get_width() - 5, 5))
+
+    def _render_overlay(self):
+        font = get_font('Arial', 14)
+        stats = self.stats()
+        lines = [f"{'phase':<10}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for name, entry in stats["phases"].items():
+            lines.append(f"{name:<10}{entry['p50']:>7.2f}{entry['p95']:>7.2f}{entry['p99']:>7.2f}")
+        lines.append(f"frames {stats['frames']}  dropped {stats['dropped']}")
+
+        rendered = [font.render(line, True, (255, 255, 255)) for line in lines]
+        width = max(line.get_width() for line in rendered) + 10
+        height = sum(line.get_height() for line in rendered) + 10
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        y = 5
+        for line in rendered:
+            panel.blit(line, (5, y))
+            y += line.get_height()
+        return panel
+
+
+# Shared by the launcher and every game
+profiler = Profiler(enabled=PROFILE_ENABLED)
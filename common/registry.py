@@ -0,0 +1,144 @@
+"""
+Discovery of the games installed under ``games/``.
+
+Every game package carries a small manifest in its ``__init__.py``:
+
+    TITLE = "Shadow Ops"     # name shown in the launcher
+    ORDER = 1                # position in the menu (optional)
+
+    def load():              # factory returning the game module
+        from . import main
+        return main
+
+Importing the manifest must have no side effects, so the launcher can
+list games without touching pygame. The game module returned by load()
+provides run() and may provide preload(), which is called on a worker
+thread to create fonts and queue its assets on ``common.loader`` ahead of
+launch.
+"""
+import importlib
+import os
+import pkgutil
+from concurrent.futures import ThreadPoolExecutor
+
+from .settings import BASE_DIR
+
+GAMES_DIR = os.path.join(BASE_DIR, "games")
+
+
+class GameEntry:
+    """A discovered game and its lazily loaded module."""
+
+    def __init__(self, name, manifest):
+        """
+        Initialize the entry.
+
+        Args:
+            name (str): The package name under games/.
+            manifest (module): The imported games.<name> package.
+        """
+        self.name = name
+        self.manifest = manifest
+        self.title = getattr(manifest, "TITLE", name.replace("_", " ").title())
+        self.order = getattr(manifest, "ORDER", 100)
+        self.module = None
+
+    def __repr__(self):
+        return f"GameEntry({self.name!r})"
+
+    def load(self):
+        """Import the game module, once."""
+        if self.module is None:
+            self.module = self.manifest.load()
+        return self.module
+
+    def prewarm(self):
+        """Import the game module and run its preload() hook."""
+        module = self.load()
+        preload = getattr(module, "preload", None)
+        if preload is not None:
+            preload()
+        return module
+
+
+def discover(games_dir=GAMES_DIR, package="games"):
+    """
+    Find every game package that has a manifest.
+
+    Args:
+        games_dir (str): The directory holding the game packages.
+        package (str): The import name of that directory.
+
+    Returns:
+        list: GameEntry objects sorted by ORDER, then title.
+    """
+    entries = []
+    for info in pkgutil.iter_modules([games_dir]):
+        if not info.ispkg:
+            continue
+        try:
+            manifest = importlib.import_module(f"{package}.{info.name}")
+        except Exception as e:
+            print(f"[REGISTRY] Skipping {info.name}: {e}")
+            continue
+        if not callable(getattr(manifest, "load", None)):
+            continue
+        entries.append(GameEntry(info.name, manifest))
+    entries.sort(key=lambda entry: (entry.order, entry.title))
+    return entries
+
+
+class GameRegistry:
+    """The discovered games plus a background thread that pre-warms them."""
+
+    def __init__(self, entries=None):
+        """
+        Initialize the registry.
+
+        Args:
+            entries (list): GameEntry objects; discovered when omitted.
+        """
+        self.entries = discover() if entries is None else entries
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prewarm")
+        self.futures = {}
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, name):
+        for entry in self.entries:
+            if entry.name == name:
+                return entry
+        raise KeyError(name)
+
+    def prewarm(self, entry):
+        """
+        Start pre-warming a game in the background, once.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the game module.
+        """
+        future = self.futures.get(entry.name)
+        if future is None:
+            future = self.futures[entry.name] = self.executor.submit(entry.prewarm)
+        return future
+
+    def load(self, entry):
+        """
+        Get a game module ready to run, waiting for any pre-warm.
+
+        Re-raises whatever the import or preload() raised.
+        """
+        future = self.prewarm(entry)
+        try:
+            return future.result()
+        except Exception:
+            # Let the next launch try again
+            del self.futures[entry.name]
+            raise
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
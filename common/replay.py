@@ -0,0 +1,399 @@
+"""
+Deterministic input recording and replay.
+
+Every game round is fully determined by its RNG seed and the action
+bitmask fed to ``step()`` on each tick, so that is all a replay stores.
+Inputs are run-length encoded, one byte of mask plus a varint tick count
+per change, so hours of play stay in the kilobytes.
+
+File layout (``.arb``)::
+
+    b"ABRP" | version byte | varint header length | JSON header
+    then a stream of ops:
+        0x00-0x7F  mask   varint ticks   the mask held for that many ticks
+        0xFE       varint seed          a new round starts with this seed
+        0xFF                            end of recording
+
+A file cut short by a crash is still readable up to its last full op.
+
+Playback re-simulates from the seeds. ``ReplayPlayer`` keeps deep-copied
+state snapshots every ``keyframe_interval`` ticks, so seeking back or
+fast-forwarding only simulates from the nearest keyframe and never
+renders the skipped ticks.
+
+    python -m common.replay info replays/shadow_ops-20261018-101500.arb
+    python -m common.replay play replays/shadow_ops-20261018-101500.arb
+"""
+import argparse
+import bisect
+import copy
+import json
+import os
+import time
+
+from .settings import FPS, RECORD_REPLAYS, REPLAYS_DIR
+
+MAGIC = b"ABRP"
+VERSION = 1
+OP_ROUND = 0xFE
+OP_END = 0xFF
+MAX_MASK = 0x7F
+
+
+def encode_varint(value):
+    """Encode a non-negative integer as LEB128 bytes."""
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def decode_varint(data, pos):
+    """
+    Decode a LEB128 integer.
+
+    Returns:
+        tuple: (value, position after it).
+
+    Raises:
+        IndexError: If the data ends inside the varint.
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+class Recorder:
+    """Streams one play session to a replay file."""
+
+    def __init__(self, path, game, options=None):
+        """
+        Open a replay file and write its header.
+
+        Args:
+            path (str): The file to write.
+            game (str): The game package name, e.g. 'shadow_ops'.
+            options (dict): new_state() options the session was played with.
+        """
+        self.path = path
+        self.file = open(path, "wb")
+        header = json.dumps({
+            "game": game,
+            "options": options or {},
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "fps": FPS,
+        }).encode("utf-8")
+        self.file.write(MAGIC + bytes([VERSION]) + encode_varint(len(header)) + header)
+        self.mask = 0
+        self.count = 0
+        self.ticks = 0
+
+    def start_round(self, seed):
+        """Mark the start of a round played with seed."""
+        self._flush()
+        self.file.write(bytes([OP_ROUND]) + encode_varint(seed))
+
+    def tick(self, inputs):
+        """Record the inputs passed to one step() call."""
+        self.ticks += 1
+        if inputs == self.mask:
+            self.count += 1
+            return
+        if inputs > MAX_MASK:
+            raise ValueError(f"input mask {inputs:#x} does not fit a replay op")
+        self._flush()
+        self.mask = inputs
+        self.count = 1
+
+    def _flush(self):
+        if self.count:
+            self.file.write(bytes([self.mask]) + encode_varint(self.count))
+            self.count = 0
+
+    def close(self):
+        if self.file.closed:
+            return
+        self._flush()
+        self.file.write(bytes([OP_END]))
+        self.file.close()
+
+
+class NullRecorder:
+    """Stands in for a Recorder when recording is switched off."""
+
+    def start_round(self, seed):
+        pass
+
+    def tick(self, inputs):
+        pass
+
+    def close(self):
+        pass
+
+
+NULL_RECORDER = NullRecorder()
+
+
+def start_recording(game, options=None, directory=REPLAYS_DIR, enabled=RECORD_REPLAYS):
+    """
+    Start recording a session if recording is enabled.
+
+    Args:
+        game (str): The game package name.
+        options (dict): new_state() options of the session.
+        directory (str): Where replay files go.
+        enabled (bool): Defaults to settings.RECORD_REPLAYS (ARENA_RECORD=1).
+
+    Returns:
+        Recorder or NullRecorder: Call start_round(), tick() and close() on it.
+    """
+    if not enabled:
+        return NULL_RECORDER
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{game}-{time.strftime('%Y%m%d-%H%M%S')}.arb")
+    return Recorder(path, game, options)
+
+
+class Round:
+    """One round of a replay: its seed and run-length encoded inputs."""
+
+    __slots__ = ("seed", "start", "length", "starts", "masks")
+
+    def __init__(self, seed, start):
+        self.seed = seed
+        self.start = start
+        self.length = 0
+        self.starts = []
+        self.masks = []
+
+    def add_run(self, mask, ticks):
+        self.starts.append(self.length)
+        self.masks.append(mask)
+        self.length += ticks
+
+    def mask_at(self, tick):
+        """Return the input mask of a tick counted from the round start."""
+        return self.masks[bisect.bisect_right(self.starts, tick) - 1]
+
+
+class Replay:
+    """A decoded replay file."""
+
+    def __init__(self, game, options, rounds, header=None, complete=True):
+        self.game = game
+        self.options = options
+        self.rounds = rounds
+        self.header = header or {}
+        self.complete = complete
+        self.total_ticks = sum(r.length for r in rounds)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a replay file.
+
+        Raises:
+            ValueError: If the file is not a replay or its header is cut.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:4] != MAGIC or len(data) < 5:
+            raise ValueError(f"{path} is not a replay file")
+        if data[4] != VERSION:
+            raise ValueError(f"{path} has unsupported replay version {data[4]}")
+        try:
+            length, pos = decode_varint(data, 5)
+        except IndexError:
+            raise ValueError(f"{path} has a truncated header")
+        header = json.loads(data[pos:pos + length].decode("utf-8"))
+        pos += length
+
+        rounds = []
+        tick = 0
+        complete = False
+        try:
+            while pos < len(data):
+                op = data[pos]
+                if op == OP_END:
+                    complete = True
+                    break
+                if op == OP_ROUND:
+                    seed, pos = decode_varint(data, pos + 1)
+                    rounds.append(Round(seed, tick))
+                    continue
+                ticks, pos = decode_varint(data, pos + 1)
+                if rounds:
+                    rounds[-1].add_run(op, ticks)
+                    tick += ticks
+        except IndexError:
+            pass  # cut off mid-op; keep everything before it
+        return cls(header["game"], header.get("options", {}), rounds, header, complete)
+
+
+class ReplayPlayer:
+    """Re-simulates a replay tick by tick, with keyframes for seeking."""
+
+    def __init__(self, game, replay, keyframe_interval=FPS * 10):
+        """
+        Initialize playback at tick 0.
+
+        Args:
+            game (module): The game module named in the replay.
+            replay (Replay): The decoded replay.
+            keyframe_interval (int): Ticks between state snapshots.
+        """
+        self.game = game
+        self.replay = replay
+        self.keyframe_interval = keyframe_interval
+        self.keyframes = {}
+        self.keyframe_ticks = []
+        self.tick = 0
+        self.state = None
+        self.round_index = -1
+        if replay.rounds:
+            self._begin_round(0)
+
+    @property
+    def finished(self):
+        return self.tick >= self.replay.total_ticks
+
+    def _begin_round(self, index):
+        self.round_index = index
+        rnd = self.replay.rounds[index]
+        self.state = self.game.new_state(rnd.seed, **self.replay.options)
+
+    def _keyframe(self):
+        if self.tick not in self.keyframes:
+            self.keyframes[self.tick] = (self.round_index, copy.deepcopy(self.state))
+            bisect.insort(self.keyframe_ticks, self.tick)
+
+    def advance(self):
+        """
+        Simulate one tick.
+
+        Returns:
+            bool: False once the replay has run out of ticks.
+        """
+        if self.finished:
+            return False
+        rounds = self.replay.rounds
+        rnd = rounds[self.round_index]
+        while self.tick - rnd.start >= rnd.length:
+            self._begin_round(self.round_index + 1)
+            rnd = rounds[self.round_index]
+        if self.tick % self.keyframe_interval == 0:
+            self._keyframe()
+        self.game.step(self.state, rnd.mask_at(self.tick - rnd.start))
+        self.tick += 1
+        return True
+
+    def seek(self, target):
+        """
+        Jump to a tick without rendering the ticks in between.
+
+        Restores the nearest keyframe at or before the target when that
+        saves work, then simulates forward.
+        """
+        target = max(0, min(target, self.replay.total_ticks))
+        i = bisect.bisect_right(self.keyframe_ticks, target) - 1
+        if i >= 0:
+            keyframe = self.keyframe_ticks[i]
+            if target < self.tick or keyframe > self.tick:
+                self.round_index, snapshot = self.keyframes[keyframe]
+                self.state = copy.deepcopy(snapshot)
+                self.tick = keyframe
+        elif target < self.tick:
+            self.tick = 0
+            self._begin_round(0)
+        while self.tick < target and self.advance():
+            pass
+
+    def fast_forward(self, ticks):
+        """Skip ahead by a number of ticks (negative rewinds)."""
+        self.seek(self.tick + ticks)
+
+
+def play(path, speed=1):
+    """Watch a replay in a window. Arrows seek/change speed, space pauses."""
+    import pygame
+
+    from .runtime import Runtime
+    from .simulation import load_game
+
+    replay = Replay.load(path)
+    game = load_game(replay.game)
+    player = ReplayPlayer(game, replay)
+    ctx = Runtime(caption=f"Replay: {os.path.basename(path)}")
+    game.preload()
+    surface = ctx.begin(game.LOGICAL_SIZE)
+    paused = False
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    return
+                elif event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key == pygame.K_RIGHT:
+                    player.fast_forward(FPS * 10)
+                elif event.key == pygame.K_LEFT:
+                    player.fast_forward(-FPS * 10)
+                elif event.key == pygame.K_UP:
+                    speed = min(speed * 2, 64)
+                elif event.key == pygame.K_DOWN:
+                    speed = max(speed // 2, 1)
+
+        if not paused:
+            for _ in range(speed):
+                if not player.advance():
+                    paused = True
+                    break
+
+        game.render(surface, player.state)
+        ctx.present()
+        ctx.clock.tick(FPS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or watch a recorded session.")
+    parser.add_argument("command", choices=("info", "play"))
+    parser.add_argument("path")
+    parser.add_argument("--speed", type=int, default=1, help="ticks per frame when playing")
+    args = parser.parse_args()
+
+    if args.command == "play":
+        play(args.path, args.speed)
+        return
+
+    from .simulation import enable_headless, load_game
+
+    enable_headless()
+    replay = Replay.load(args.path)
+    print(f"{args.path}: {replay.game}, {len(replay.rounds)} rounds, {replay.total_ticks} ticks, "
+          f"{os.path.getsize(args.path)} bytes{'' if replay.complete else ' (truncated)'}")
+    game = load_game(replay.game)
+    player = ReplayPlayer(game, replay)
+    start = time.perf_counter()
+    for index, rnd in enumerate(replay.rounds):
+        player.seek(rnd.start + rnd.length)
+        print(f"round {index}: seed {rnd.seed}, {rnd.length} ticks, score {player.state.score}")
+    elapsed = time.perf_counter() - start
+    print(f"simulated in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+The shared pygame context for the launcher and the games.
+
+A single ``Runtime`` owns the window, the clock and the mixer for the
+whole process. The launcher creates it once and passes it to each game's
+``run(ctx)``; a game asks for a surface at its own logical resolution
+with ``begin()`` and shows it with ``present()``, which scales it into
+the window once per frame. Returning from ``run()`` hands the same window
+back to the launcher, so switching games never re-creates the display
+or re-initialises pygame.
+
+How a scene is scaled is chosen by settings.SCALE_MODE (ARENA_SCALE):
+
+    fast     nearest-neighbour to the largest fit (the default)
+    integer  the largest whole-number fit, so pixels stay square
+    smooth   filtered to the largest fit
+
+At a whole-number scale present() can scale just the areas a frame
+changed, so ``DirtyRenderer`` keeps its partial updates; otherwise the
+frame is scaled in full. The window may be resized or opened at any size
+(ARENA_WINDOW, ARENA_FULLSCREEN): the fit, the window subsurface scaled
+into and the letterbox bars are worked out again only when it changes,
+in handle_event(), never per frame.
+
+With the "gpu" backend the window is drawn by SDL's renderer instead
+(see ``common.gpu``): begin() returns a GPUCanvas, and scaling to the
+window happens on the GPU.
+"""
+import sys
+
+import pygame
+
+from .gpu import GPUCanvas, TextureCache, open_renderer
+from .settings import (BLACK, FULLSCREEN, GAME_TITLE, RENDER_BACKEND, SCALE_MODE, SCREEN_HEIGHT, SCREEN_WIDTH,
+                       WINDOW_SIZE)
+
+
+class Runtime:
+    """Display, clock and mixer shared by every scene."""
+
+    def __init__(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT), caption=GAME_TITLE, flags=pygame.RESIZABLE,
+                 backend=RENDER_BACKEND, scale_mode=SCALE_MODE):
+        """
+        Initialize pygame and open the window.
+
+        Args:
+            size (tuple): The window size in pixels; settings.WINDOW_SIZE
+                (ARENA_WINDOW) takes precedence.
+            caption (str): The initial window caption.
+            flags (int): Flags passed to pygame.display.set_mode(); not
+                used by the GPU backend.
+            backend (str): "software" or "gpu".
+            scale_mode (str): How scenes are scaled to the window: "fast",
+                "integer" or "smooth".
+        """
+        pygame.init()
+        size = WINDOW_SIZE or size
+        if FULLSCREEN:
+            size = (0, 0)
+            flags = (flags & ~pygame.RESIZABLE) | pygame.FULLSCREEN
+        self.scale_mode = scale_mode
+        self.renderer = None
+        if backend == "gpu":
+            try:
+                self.gpu_window, self.renderer = open_renderer(size, caption, FULLSCREEN, scale_mode == "smooth")
+            except (ImportError, pygame.error) as e:
+                print(f"[RUNTIME] GPU renderer unavailable, using software rendering: {e}")
+        if self.renderer is not None:
+            self.textures = TextureCache(self.renderer)
+            self.window = GPUCanvas(self.renderer, self.gpu_window.size, self.textures)
+        else:
+            self.window = pygame.display.set_mode(size, flags)
+            pygame.display.set_caption(caption)
+        # Whether the scene surface keeps its pixels from frame to frame;
+        # a GPU canvas must be redrawn in full every frame
+        self.retained = self.renderer is None
+        self.clock = pygame.time.Clock()
+        # pygame.init() leaves the mixer uninitialised when there is no
+        # audio device; games must cope with that
+        self.mixer = pygame.mixer if pygame.mixer.get_init() else None
+
+        self.surface = self.window
+        self.logical_size = self.window.get_size()
+        self.viewport = self.window.get_rect()
+        self.target = None
+        self.scale = 1
+        self.scaler = pygame.transform.scale
+        self.needs_flip = False
+        self.buffers = {}
+
+    @property
+    def size(self):
+        """The window size in pixels."""
+        return self.window.get_size()
+
+    @property
+    def partial_updates(self):
+        """Whether present() can update just some areas of the window."""
+        # A whole-number scale maps every scene pixel to a block of window
+        # pixels, so areas can be scaled on their own without seams
+        return self.renderer is None and (self.target is None or isinstance(self.scale, int))
+
+    def begin(self, logical_size=None, caption=None):
+        """
+        Start a scene that draws at a logical resolution.
+
+        Args:
+            logical_size (tuple): The size the scene draws at; defaults to
+                the window size.
+            caption (str): The window caption for the scene.
+
+        Returns:
+            pygame.Surface: The surface to draw each frame on. It is the
+            window itself when the sizes match, otherwise an offscreen
+            buffer that present() scales into the window, letterboxed to
+            keep its aspect ratio. With the GPU backend, a GPUCanvas.
+        """
+        logical_size = tuple(logical_size or self.window.get_size())
+        if self.renderer is not None:
+            return self._begin_gpu(logical_size, caption)
+        if caption is not None:
+            pygame.display.set_caption(caption)
+
+        self._use(logical_size)
+
+        # Do not bill the new scene for the time spent in the previous one
+        self.clock.tick()
+        return self.surface
+
+    def _use(self, logical_size):
+        # Draw straight on the window when no scaling is needed
+        self.logical_size = logical_size
+        if logical_size == self.window.get_size():
+            self.surface = self.window
+        else:
+            surface = self.buffers.get(logical_size)
+            if surface is None:
+                surface = self.buffers[logical_size] = pygame.Surface(logical_size).convert()
+            self.surface = surface
+        self._layout()
+
+    def _layout(self):
+        # Fit the scene into the window; redone only when either changes
+        window_rect = self.window.get_rect()
+        width, height = self.surface.get_size()
+        if self.surface is self.window:
+            self.viewport = window_rect
+            self.target = None
+            self.scale = 1
+            return
+        scale = min(window_rect.width / width, window_rect.height / height)
+        if self.scale_mode == "integer" and scale >= 1:
+            scale = int(scale)
+        elif self.scale_mode == "fast" and scale == int(scale):
+            # Nearest-neighbour at a whole factor is integer scaling anyway
+            scale = int(scale)
+        self.scale = scale
+        self.viewport = pygame.Rect(0, 0, int(width * scale), int(height * scale))
+        self.viewport.center = window_rect.center
+        self.target = self.window.subsurface(self.viewport)
+        self.scaler = pygame.transform.scale
+        if self.scale_mode == "smooth" and self.surface.get_bitsize() in (24, 32):
+            self.scaler = pygame.transform.smoothscale
+        # The letterbox bars are drawn once, not every frame
+        self.window.fill(BLACK)
+        self.needs_flip = True
+
+    def _begin_gpu(self, logical_size, caption):
+        if caption is not None:
+            self.gpu_window.title = caption
+        surface = self.buffers.get(logical_size)
+        if surface is None:
+            surface = self.buffers[logical_size] = GPUCanvas(self.renderer, logical_size, self.textures)
+        self.surface = surface
+        self.logical_size = logical_size
+        # The renderer letterboxes the logical size into the window and
+        # maps mouse events back to it
+        self.renderer.logical_size = logical_size
+        self.viewport = self.window.get_rect()
+        self.target = None
+        self._clear()
+        self.clock.tick()
+        return self.surface
+
+    def _clear(self):
+        self.renderer.draw_color = pygame.Color(BLACK)
+        self.renderer.clear()
+
+    def handle_event(self, event):
+        """
+        Follow window size changes.
+
+        Returns:
+            bool: True if the window was resized. The scene must then draw
+            on ctx.surface, which may be a different surface, in full.
+        """
+        if event.type != pygame.VIDEORESIZE:
+            return False
+        if self.renderer is not None:
+            # The renderer refits the logical size by itself
+            self.window = GPUCanvas(self.renderer, self.gpu_window.size, self.textures)
+            return True
+        self.window = pygame.display.get_surface()
+        self._use(self.logical_size)
+        return True
+
+    def present(self, rects=None):
+        """
+        Scale the scene surface into the window if needed and flip.
+
+        Args:
+            rects (list): Only update these areas of the window instead of
+                flipping it all. Used when partial_updates is True,
+                ignored otherwise.
+        """
+        if self.renderer is not None:
+            self.renderer.present()
+            # The back buffer is undefined after a present
+            self._clear()
+            return
+        if self.target is None:
+            if rects is not None:
+                pygame.display.update(rects)
+            else:
+                pygame.display.flip()
+            return
+        if rects is not None and isinstance(self.scale, int) and not self.needs_flip:
+            # Scale just the changed areas, each to an exact block
+            scale = self.scale
+            left, top = self.viewport.topleft
+            updated = []
+            for rect in rects:
+                area = pygame.Rect(rect.x * scale, rect.y * scale, rect.width * scale, rect.height * scale)
+                pygame.transform.scale(self.surface.subsurface(rect), area.size, self.target.subsurface(area))
+                updated.append(area.move(left, top))
+            pygame.display.update(updated)
+            return
+        self.scaler(self.surface, self.viewport.size, self.target)
+        if self.needs_flip:
+            pygame.display.flip()
+            self.needs_flip = False
+        else:
+            pygame.display.update(self.viewport)
+
+    def to_logical(self, pos):
+        """Map a window position, e.g. of the mouse, to scene coordinates."""
+        if self.target is None:
+            return pos
+        width, height = self.surface.get_size()
+        return ((pos[0] - self.viewport.x) * width // self.viewport.width,
+                (pos[1] - self.viewport.y) * height // self.viewport.height)
+
+    def quit(self):
+        """Shut pygame down and exit the process."""
+        pygame.quit()
+        sys.exit()
@@ -0,0 +1,98 @@
+"""
+Frame pacing for the launcher and the games.
+
+A ``FrameScheduler`` owns the wait between frames and hands the loop the
+events that arrived meanwhile. How long it waits depends on its mode:
+
+    ACTIVE   gameplay: capped at the full frame rate
+    STATIC   menus, game over: a low refresh rate, but any event wakes
+             the loop at once so input never feels sluggish
+    IDLE     nothing animates: sleep until an event arrives
+
+Keeping static screens off the full frame rate saves power, and on the
+cabinets' thermally limited CPUs it leaves headroom for real gameplay.
+
+``advance()`` then says how to move the simulation forward: a number of
+fixed ticks by default, or with ``variable=True`` a single step scaled
+by the measured frame time. Variable steps are smoother on hardware that
+cannot hold the cap, but they are not deterministic, so they are never
+recorded for replays.
+"""
+import pygame
+
+from .settings import FPS, STATIC_FPS, VARIABLE_TIMESTEP
+from .simulation import FixedTimestep
+
+ACTIVE = "active"
+STATIC = "static"
+IDLE = "idle"
+
+
+class FrameScheduler:
+    """Paces a loop according to what is on screen."""
+
+    def __init__(self, clock, mode=ACTIVE, fps=FPS, static_fps=STATIC_FPS, variable=VARIABLE_TIMESTEP,
+                 max_steps=5):
+        """
+        Initialize the scheduler.
+
+        Args:
+            clock (pygame.time.Clock): The clock of the shared Runtime.
+            mode (str): ACTIVE, STATIC or IDLE; may be changed any time.
+            fps (int): The frame cap, and the simulation tick rate.
+            static_fps (int): The refresh rate in STATIC mode.
+            variable (bool): Advance the simulation by measured time
+                rather than in fixed ticks.
+            max_steps (int): Most ticks simulated for one frame, in either
+                timestep mode.
+        """
+        self.clock = clock
+        self.fps = fps
+        self.static_fps = static_fps
+        self.variable = variable
+        self.max_steps = max_steps
+        self.timestep = FixedTimestep(fps, max_steps)
+        self.mode = mode
+        self.elapsed = 0
+        self.last_frame = 0
+
+    def wait(self):
+        """
+        Sleep until the next frame is due.
+
+        Returns:
+            list: The events that arrived, in order; the loop must not
+            also call pygame.event.get().
+        """
+        if self.mode == ACTIVE:
+            self.elapsed = self.clock.tick(self.fps)
+            events = pygame.event.get()
+        else:
+            # Never faster than the cap, even while events keep arriving
+            self.clock.tick(self.fps)
+            if self.mode == STATIC:
+                # Sleep out the rest of the slower frame unless an event
+                # comes first; wait(0) would block forever
+                remaining = 1000 // self.static_fps - (pygame.time.get_ticks() - self.last_frame)
+                first = pygame.event.wait(remaining) if remaining > 0 else None
+            else:
+                first = pygame.event.wait()
+            events = pygame.event.get()
+            if first is not None and first.type != pygame.NOEVENT:
+                events.insert(0, first)
+            self.clock.tick()
+            self.elapsed = pygame.time.get_ticks() - self.last_frame
+        self.last_frame = pygame.time.get_ticks()
+        return events
+
+    def advance(self):
+        """
+        Get how to advance the simulation for the current frame.
+
+        Returns:
+            tuple: (steps, dt). Call step(state, inputs, dt) steps times;
+            dt is in ticks, exactly 1 for fixed ticks.
+        """
+        if self.variable:
+            return 1, min(self.elapsed * self.fps / 1000.0, self.max_steps)
+        return self.timestep.advance(self.elapsed), 1
@@ -0,0 +1,375 @@
+"""
+Persistent high scores and play statistics.
+
+Finished rounds are appended to a small binary log, and each game's best
+``keep`` scores are held in memory, sorted, for the launcher's
+leaderboard. ``submit()`` only updates memory and queues the encoded
+record; a background thread writes queued records in one batch and
+fsyncs, so a game over never waits on the disk.
+
+File layout (``scores.bin``)::
+
+    b"ABSC" | version byte
+    then records:
+        varint payload length | payload | CRC-32 of payload (4 bytes, LE)
+    payload:
+        kind byte | varint name length | game name | varint fields
+        KIND_SCORE   score, level, ticks, seed, unix time
+        KIND_TOTALS  rounds played, ticks played (written by compaction)
+
+On power loss the last record may be cut short or garbled. Loading stops
+at the first record that is incomplete or fails its checksum and
+truncates the file there, so the log is always appendable again.
+
+The log is compacted at load once most of it is scores that fell off the
+tables: it is rewritten with the kept scores plus one totals record per
+game, through a temporary file that atomically replaces the old one.
+
+    python -m common.scores              # every game's top 10
+    python -m common.scores shadow_ops   # one game
+"""
+import argparse
+import atexit
+import bisect
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+
+from .replay import decode_varint, encode_varint
+from .settings import SCORES_KEPT, SCORES_PATH
+
+MAGIC = b"ABSC"
+VERSION = 1
+HEADER = MAGIC + bytes([VERSION])
+KIND_SCORE = 1
+KIND_TOTALS = 2
+# Rewrite the log once it holds this many records per kept one
+COMPACT_RATIO = 4
+CRC = struct.Struct("<I")
+
+
+class Score:
+    """One finished round."""
+
+    __slots__ = ("game", "score", "level", "ticks", "seed", "created")
+
+    def __init__(self, game, score, level=0, ticks=0, seed=0, created=None):
+        self.game = game
+        self.score = score
+        self.level = level
+        self.ticks = ticks
+        self.seed = seed
+        self.created = int(time.time()) if created is None else created
+
+    def __repr__(self):
+        return f"Score({self.game!r}, {self.score}, level={self.level}, ticks={self.ticks})"
+
+    def rank_key(self):
+        # Highest score first; on a tie the earlier round ranks higher
+        return (-self.score, self.created)
+
+
+def encode_record(kind, game, *fields):
+    """Frame one record: length, payload, checksum."""
+    name = game.encode("utf-8")
+    payload = bytes([kind]) + encode_varint(len(name)) + name + b"".join(map(encode_varint, fields))
+    return encode_varint(len(payload)) + payload + CRC.pack(zlib.crc32(payload))
+
+
+def decode_payload(payload):
+    """
+    Split a record payload.
+
+    Returns:
+        tuple: (kind, game name, list of integer fields).
+    """
+    kind = payload[0]
+    length, pos = decode_varint(payload, 1)
+    game = payload[pos:pos + length].decode("utf-8")
+    pos += length
+    fields = []
+    while pos < len(payload):
+        value, pos = decode_varint(payload, pos)
+        fields.append(value)
+    return kind, game, fields
+
+
+def read_log(data):
+    """
+    Read the intact records of a log.
+
+    Args:
+        data (bytes): The whole file, header included.
+
+    Returns:
+        tuple: (list of payloads, offset where the intact part ends).
+
+    Raises:
+        ValueError: If the data is not a score log.
+    """
+    if data[:len(HEADER)] != HEADER:
+        raise ValueError("not an Arena Blitz score log")
+    payloads = []
+    pos = len(HEADER)
+    while pos < len(data):
+        try:
+            length, start = decode_varint(data, pos)
+        except IndexError:
+            break
+        end = start + length
+        if end + CRC.size > len(data):
+            break
+        payload = data[start:end]
+        if CRC.unpack_from(data, end)[0] != zlib.crc32(payload):
+            break
+        payloads.append(payload)
+        pos = end + CRC.size
+    return payloads, pos
+
+
+class GameScores:
+    """The kept scores and running totals of one game."""
+
+    __slots__ = ("top", "keys", "played", "ticks")
+
+    def __init__(self):
+        self.top = []
+        # rank_key() of each entry of top, for bisecting
+        self.keys = []
+        self.played = 0
+        self.ticks = 0
+
+
+class ScoreStore:
+    """High scores backed by an append-only log written in the background."""
+
+    def __init__(self, path=SCORES_PATH, keep=SCORES_KEPT):
+        """
+        Initialize the store. Nothing is read until load() or first use.
+
+        Args:
+            path (str): The log file; created with its directory.
+            keep (int): Scores kept per game.
+        """
+        self.path = path
+        self.keep = keep
+        self.games = {}
+        self.records = 0
+        self.loaded = False
+        self.lock = threading.Lock()
+        self.writes = queue.Queue()
+        self.thread = None
+        self.batches = 0
+
+    def load(self, repair=True):
+        """
+        Read the log once, recovering from a torn tail; cheap afterwards.
+
+        Args:
+            repair (bool): Whether to create, truncate or compact the file
+                as needed. Read-only viewers pass False and leave the file
+                exactly as they found it.
+        """
+        with self.lock:
+            if not self.loaded:
+                self._load(repair)
+                self.loaded = True
+
+    def _load(self, repair):
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b""
+        if not data:
+            if repair:
+                self._rewrite()
+            return
+        try:
+            payloads, end = read_log(data)
+        except ValueError as e:
+            if not repair:
+                print(f"[SCORES] Cannot read {self.path}: {e}")
+                return
+            print(f"[SCORES] Starting a new log, {self.path}: {e}")
+            os.replace(self.path, self.path + ".bad")
+            self._rewrite()
+            return
+        if end < len(data) and repair:
+            print(f"[SCORES] Dropped {len(data) - end} bytes of an interrupted write")
+            with open(self.path, "r+b") as f:
+                f.truncate(end)
+                f.flush()
+                os.fsync(f.fileno())
+
+        for payload in payloads:
+            kind, game, fields = decode_payload(payload)
+            table = self._table(game)
+            if kind == KIND_SCORE:
+                self._insert(table, Score(game, *fields[:5]))
+                table.played += 1
+                table.ticks += fields[2]
+            elif kind == KIND_TOTALS:
+                table.played += fields[0]
+                table.ticks += fields[1]
+        self.records = len(payloads)
+        if repair and self.records > COMPACT_RATIO * max(self.keep, sum(len(t.top) for t in self.games.values())):
+            self._rewrite()
+
+    def _table(self, game):
+        table = self.games.get(game)
+        if table is None:
+            table = self.games[game] = GameScores()
+        return table
+
+    def _insert(self, table, score):
+        key = score.rank_key()
+        i = bisect.bisect_right(table.keys, key)
+        table.keys.insert(i, key)
+        table.top.insert(i, score)
+        del table.keys[self.keep:]
+        del table.top[self.keep:]
+
+    def _rewrite(self):
+        # Kept scores plus the totals of everything that fell off the tables
+        parts = [HEADER]
+        for game, table in self.games.items():
+            parts.append(encode_record(KIND_TOTALS, game, table.played - len(table.top),
+                                       table.ticks - sum(s.ticks for s in table.top)))
+            for s in table.top:
+                parts.append(encode_record(KIND_SCORE, game, s.score, s.level, s.ticks, s.seed, s.created))
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        temp = self.path + ".tmp"
+        with open(temp, "wb") as f:
+            f.write(b"".join(parts))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, self.path)
+        self.records = len(parts) - 1
+
+    def submit(self, game, score, level=0, ticks=0, seed=0):
+        """
+        Record a finished round. Returns at once; the write happens later.
+
+        Args:
+            game (str): The game package name.
+            score (int): The final score.
+            level (int): The level reached, if the game has levels.
+            ticks (int): Simulation ticks the round lasted.
+            seed (int): The round's seed, to find it among replays.
+
+        Returns:
+            Score: The new entry.
+        """
+        self.load()
+        entry = Score(game, int(score), int(level), int(ticks), int(seed))
+        with self.lock:
+            table = self._table(game)
+            self._insert(table, entry)
+            table.played += 1
+            table.ticks += entry.ticks
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="scores", daemon=True)
+                self.thread.start()
+                atexit.register(self.close)
+        self.writes.put(encode_record(KIND_SCORE, game, entry.score, entry.level, entry.ticks,
+                                      entry.seed, entry.created))
+        return entry
+
+    def _run(self):
+        writes = self.writes
+        with open(self.path, "ab") as f:
+            while True:
+                batch = [writes.get()]
+                try:
+                    while True:
+                        batch.append(writes.get_nowait())
+                except queue.Empty:
+                    pass
+                done = None in batch
+                records = [record for record in batch if record is not None]
+                if records:
+                    try:
+                        f.write(b"".join(records))
+                        f.flush()
+                        os.fsync(f.fileno())
+                        self.records += len(records)
+                        self.batches += 1
+                    except OSError as e:
+                        print(f"[SCORES] Could not save scores: {e}")
+                if done:
+                    return
+
+    def top(self, game, n=10):
+        """
+        Get a game's best scores.
+
+        Returns:
+            list: Up to n Score objects, best first.
+        """
+        self.load()
+        with self.lock:
+            table = self.games.get(game)
+            return table.top[:n] if table else []
+
+    def best(self, game):
+        """Return a game's high score, 0 before any round finished."""
+        top = self.top(game, 1)
+        return top[0].score if top else 0
+
+    def stats(self, game):
+        """
+        Report a game's totals.
+
+        Returns:
+            dict: played (rounds), ticks (played in all rounds) and best.
+        """
+        self.load()
+        with self.lock:
+            table = self.games.get(game) or GameScores()
+            return {
+                "played": table.played,
+                "ticks": table.ticks,
+                "best": table.top[0].score if table.top else 0,
+            }
+
+    def close(self):
+        """Write everything still queued and stop the writer thread."""
+        thread = self.thread
+        if thread is not None:
+            self.writes.put(None)
+            thread.join()
+            self.thread = None
+            atexit.unregister(self.close)
+
+
+# Shared by the launcher and every game
+scores = ScoreStore()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the saved high scores.")
+    parser.add_argument("game", nargs="?", help="game package name; all games when omitted")
+    parser.add_argument("-n", type=int, default=10, help="scores per game (default 10)")
+    parser.add_argument("--path", default=SCORES_PATH, help="score log to read")
+    args = parser.parse_args()
+
+    store = ScoreStore(args.path)
+    store.load(repair=False)
+    if not store.games:
+        print("No scores saved yet")
+        return
+    for game in [args.game] if args.game else sorted(store.games):
+        stats = store.stats(game)
+        print(f"{game}: {stats['played']} rounds, {stats['ticks']} ticks")
+        for rank, s in enumerate(store.top(game, args.n), 1):
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(s.created))
+            print(f"  {rank:2}. {s.score:8}  level {s.level:<3} {when}  seed {s.seed}")
+
+
+if __name__ == "__main__":
+    main()
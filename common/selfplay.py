@@ -0,0 +1,168 @@
+"""
+Parallel headless self-play for difficulty tuning.
+
+Plays many independent seeded rounds on every core and sweeps game
+tunables (the new_state() options) over a grid of values:
+
+    python -m common.selfplay shadow_ops --games 20000 --policy bot \
+        --sweep spawn_rate=20,30,40 --sweep speed_ramp=0.25,0.5
+    python -m common.selfplay cyber_ninja_assault --games 5000 --policy bot \
+        --sweep speed_ramp=0.1,0.2,0.4 --out sweep.jsonl
+
+Rounds are handed to worker processes in chunks of seeds. A worker sends
+back only packed integer arrays of score, survival ticks and level per
+round, never game states, and the parent prints each configuration's
+distribution as soon as all of its chunks are in.
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .settings import FPS
+from .simulation import POLICIES, enable_headless, get_policy, load_game, run_headless
+
+CHUNK_SIZE = 250  # rounds per worker task
+
+
+def play_chunk(game_name, options, policy, seeds, max_frames):
+    """
+    Play one round per seed. Runs in a worker.
+
+    Returns:
+        tuple: Arrays of scores, survival ticks and levels reached.
+    """
+    # Here rather than in a pool initializer, which needs Python 3.7
+    enable_headless()
+    game = load_game(game_name)
+    scores = array("q")
+    ticks = array("q")
+    levels = array("q")
+    for seed in seeds:
+        state = run_headless(game, seed, get_policy(game, policy, seed), max_frames, **options)
+        scores.append(state.score)
+        ticks.append(state.frame)
+        levels.append(getattr(state, "level", 1))
+    return scores, ticks, levels
+
+
+def distribution(values):
+    """Summarize a list of numbers as mean, min, max and percentiles."""
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    summary = {"mean": sum(ordered) / len(ordered), "min": ordered[0], "max": ordered[-1]}
+    for pct in (10, 50, 90, 99):
+        summary[f"p{pct}"] = ordered[round(pct / 100.0 * last)]
+    return summary
+
+
+def parse_sweep(specs):
+    """
+    Expand --sweep name=v1,v2 arguments into every combination of options.
+
+    Returns:
+        list: One options dict per combination; [{}] without sweeps.
+    """
+    names = []
+    grids = []
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if not values:
+            raise ValueError(f"expected name=v1,v2,... but got {spec!r}")
+        parsed = []
+        for value in values.split(","):
+            try:
+                parsed.append(int(value))
+            except ValueError:
+                parsed.append(float(value))
+        names.append(name)
+        grids.append(parsed)
+    return [dict(zip(names, combo)) for combo in itertools.product(*grids)]
+
+
+def sweep(game_name, configs, games, policy="bot", seed=0, max_frames=100000, workers=None):
+    """
+    Play ``games`` rounds of every configuration across a process pool.
+
+    Every configuration is played with the same seeds, so differences
+    between them come from the options alone.
+
+    Yields:
+        dict: The options and the score, survival time and level
+        distributions of each configuration, as soon as it completes.
+    """
+    pending = {}
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for index, options in enumerate(configs):
+            chunks = 0
+            for start in range(seed, seed + games, CHUNK_SIZE):
+                seeds = range(start, min(start + CHUNK_SIZE, seed + games))
+                future = pool.submit(play_chunk, game_name, options, policy, seeds, max_frames)
+                futures[future] = index
+                chunks += 1
+            pending[index] = chunks
+            results[index] = (array("q"), array("q"), array("q"))
+
+        for future in as_completed(futures):
+            index = futures.pop(future)
+            for merged, part in zip(results[index], future.result()):
+                merged.extend(part)
+            pending[index] -= 1
+            if pending[index]:
+                continue
+            scores, ticks, levels = results.pop(index)
+            yield {
+                "game": game_name,
+                "options": configs[index],
+                "policy": policy,
+                "rounds": len(scores),
+                "score": distribution(scores),
+                "survival_s": distribution([t / FPS for t in ticks]),
+                "level": distribution(levels),
+            }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep game tunables with parallel headless self-play.")
+    parser.add_argument("game", help="game package name, e.g. shadow_ops")
+    parser.add_argument("--games", type=int, default=1000, help="rounds per configuration")
+    parser.add_argument("--sweep", action="append", default=[], metavar="NAME=V1,V2",
+                        help="new_state() option and the values to try; repeat for a grid")
+    parser.add_argument("--policy", choices=POLICIES, default="bot")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first round")
+    parser.add_argument("--max-frames", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=None, help="defaults to one per core")
+    parser.add_argument("--out", help="append one JSON line per configuration")
+    args = parser.parse_args()
+
+    configs = parse_sweep(args.sweep)
+    workers = args.workers or os.cpu_count()
+    print(f"{args.game}: {len(configs)} configurations x {args.games} rounds on {workers} workers")
+    out = open(args.out, "a") if args.out else None
+    start = time.perf_counter()
+    try:
+        for result in sweep(args.game, configs, args.games, args.policy, args.seed, args.max_frames, workers):
+            score = result["score"]
+            survival = result["survival_s"]
+            options = " ".join(f"{k}={v}" for k, v in result["options"].items()) or "defaults"
+            print(f"{options:<36} score p10 {score['p10']:>6} p50 {score['p50']:>6} p90 {score['p90']:>6} "
+                  f"mean {score['mean']:>8.1f}  survival p50 {survival['p50']:>6.1f}s  "
+                  f"level p50 {result['level']['p50']}")
+            if out:
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+    finally:
+        if out:
+            out.close()
+    elapsed = time.perf_counter() - start
+    rounds = len(configs) * args.games
+    print(f"{rounds} rounds in {elapsed:.1f}s ({rounds / elapsed:.0f} rounds/s)")
+
+
+if __name__ == "__main__":
+    main()
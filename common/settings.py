@@ -20,6 +20,7 @@ GAME_TITLE = "Arena Blitz"
 SOUND_ENABLED = True
 MUSIC_VOLUME = 0.5
 SFX_VOLUME = 0.7
+AUDIO_CHANNELS = 16  # mixer channels pooled for sound effects
 
 # Asset paths
 import os
@@ -37,3 +38,79 @@ SOUNDS_DIR = os.path.join(ASSETS_DIR, "sounds")
 def get_game_assets_dir(game_name):
     """Get the assets directory for a specific game."""
     return os.path.join(BASE_DIR, "games", game_name, "assets")
+
+# Asset cache settings
+ASSET_CACHE_BUDGET = 64 * 1024 * 1024  # bytes of decoded surfaces kept resident
+BAKE_CACHE_ENABLED = True  # keep pre-scaled raw copies of images on disk
+LOADER_WORKERS = 4  # threads decoding assets in the background
+CACHE_DIRNAME = ".cache"
+
+def get_cache_dir(path):
+    """
+    Get the bake cache directory for an asset file.
+
+    Files under an ``assets`` directory (the shared ASSETS_DIR or a game's
+    get_game_assets_dir()) are cached in ``<that assets dir>/.cache``;
+    anything else in a ``.cache`` directory next to the file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    probe = directory
+    while True:
+        if os.path.basename(probe) == "assets":
+            return os.path.join(probe, CACHE_DIRNAME)
+        parent = os.path.dirname(probe)
+        if parent == probe:
+            return os.path.join(directory, CACHE_DIRNAME)
+        probe = parent
+
+# Instrumentation: ARENA_PROFILE=1 starts with the frame profiler enabled
+PROFILE_ENABLED = os.environ.get("ARENA_PROFILE") == "1"
+
+# Rendering: ARENA_DIRTY=1 repaints only the areas that change in the
+# games; frames dirtier than the threshold (a fraction of the screen)
+# fall back to a full flip
+DIRTY_RECTS = os.environ.get("ARENA_DIRTY") == "1"
+DIRTY_FULL_THRESHOLD = 0.4
+# Display: scenes draw at their own logical resolution and are scaled to
+# the window once per frame. ARENA_WINDOW=1920x1080 overrides the window
+# size, ARENA_FULLSCREEN=1 uses the whole panel, and ARENA_SCALE picks
+# the scaler: fast (nearest-neighbour fit), integer (sharp whole-number
+# factor, letting dirty rectangles be scaled alone) or smooth (filtered)
+def parse_size(text):
+    """Parse 'WIDTHxHEIGHT' into a tuple; None for an empty value."""
+    if not text:
+        return None
+    width, height = text.lower().split("x")
+    return (int(width), int(height))
+
+WINDOW_SIZE = parse_size(os.environ.get("ARENA_WINDOW"))
+FULLSCREEN = os.environ.get("ARENA_FULLSCREEN") == "1"
+SCALE_MODE = os.environ.get("ARENA_SCALE", "fast")
+# ARENA_RENDERER=gpu draws through SDL's accelerated renderer, falling
+# back to software blitting when it is unavailable
+RENDER_BACKEND = os.environ.get("ARENA_RENDERER", "software")
+
+# Frame pacing: static screens (menus, game over) refresh at STATIC_FPS;
+# ARENA_VARIABLE_DT=1 advances the games by measured frame time instead
+# of fixed ticks
+STATIC_FPS = 15
+VARIABLE_TIMESTEP = os.environ.get("ARENA_VARIABLE_DT") == "1"
+
+# Replays: ARENA_RECORD=1 records every session's seeds and inputs
+RECORD_REPLAYS = os.environ.get("ARENA_RECORD") == "1"
+REPLAYS_DIR = os.path.join(BASE_DIR, "replays")
+
+# High scores: an append-only log, see common/scores.py
+SAVES_DIR = os.path.join(BASE_DIR, "saves")
+SCORES_PATH = os.path.join(SAVES_DIR, "scores.bin")
+SCORES_KEPT = 100  # best scores kept per game
+
+# Enemy AI: enemies within AI_NEAR_DISTANCE pixels of their target decide
+# every tick, farther ones every AI_FAR_INTERVAL ticks; at most
+# AI_DECISION_BUDGET far decisions are made per tick, see common/ai.py
+AI_NEAR_DISTANCE = 200
+AI_FAR_INTERVAL = 4
+AI_DECISION_BUDGET = 64
+
+# Effects: the most particles alive at once, see common/particles.py
+PARTICLE_CAPACITY = 2048
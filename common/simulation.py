@@ -0,0 +1,241 @@
+"""
+Fixed-timestep simulation helpers shared by the games.
+
+Every game module exposes the same pieces:
+
+    new_state(seed=None)   -> a fresh game state with its own seeded RNG
+    step(state, inputs, dt=1)
+                           -> advance the state by one tick, or by dt
+                              ticks under a variable timestep
+    render(surface, state) -> draw the state; never mutates it
+    preload()              -> create fonts and start streaming assets;
+                              call before the first render(), which
+                              waits for any load still in flight
+    bot_policy(state)      -> a heuristic action bitmask for self-play
+    LOGICAL_SIZE           -> the (width, height) render() draws at; pass
+                              it to Runtime.begin() so the scene is
+                              scaled to the window
+
+``run()`` in each game glues them together for interactive play with a
+``common.scheduler.FrameScheduler``, which paces the loop as ACTIVE,
+STATIC or IDLE and advances ``step`` by whole ticks, or by a variable dt
+when VARIABLE_TIMESTEP is set. ``run_headless`` drives ``step`` alone, in
+whole ticks, as fast as the CPU allows for balancing and regression runs.
+``FixedTimestep`` below is the tick accumulator the scheduler builds on.
+"""
+import argparse
+import importlib
+import os
+import random
+import time
+
+from .settings import FPS
+
+# Input action bits consumed by step()
+ACTION_LEFT = 1 << 0
+ACTION_RIGHT = 1 << 1
+ACTION_UP = 1 << 2
+ACTION_DOWN = 1 << 3
+
+ALL_ACTIONS = ACTION_LEFT | ACTION_RIGHT | ACTION_UP | ACTION_DOWN
+
+POLICIES = ("idle", "random", "bot")
+
+
+def read_inputs(keys):
+    """
+    Convert a pygame key state into an action bitmask.
+
+    Args:
+        keys: The sequence returned by pygame.key.get_pressed().
+
+    Returns:
+        int: The pressed actions as ACTION_* bits.
+    """
+    import pygame
+
+    inputs = 0
+    if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        inputs |= ACTION_LEFT
+    if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        inputs |= ACTION_RIGHT
+    if keys[pygame.K_UP] or keys[pygame.K_w]:
+        inputs |= ACTION_UP
+    if keys[pygame.K_DOWN] or keys[pygame.K_s]:
+        inputs |= ACTION_DOWN
+    return inputs
+
+
+class FixedTimestep:
+    """Accumulates real frame time and hands out whole simulation ticks."""
+
+    def __init__(self, rate=FPS, max_steps=5):
+        """
+        Initialize the timestep.
+
+        Args:
+            rate (int): Simulation ticks per second.
+            max_steps (int): Most ticks run for a single frame, so a long
+                stall does not snowball into an ever longer catch-up.
+        """
+        self.dt = 1000.0 / rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def advance(self, elapsed_ms):
+        """
+        Add elapsed real time and return how many ticks are due.
+
+        Args:
+            elapsed_ms (float): Milliseconds since the previous frame, as
+                returned by pygame.time.Clock.tick().
+
+        Returns:
+            int: Number of times step() should run this frame.
+        """
+        self.accumulator += elapsed_ms
+        steps = int(self.accumulator // self.dt)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.dt
+        return steps
+
+
+def whole_ticks(state, dt):
+    """
+    Count the whole ticks completed by a step of dt ticks.
+
+    Per-tick counters such as the score use this to stay integers under a
+    variable timestep; the fraction left over is kept in state.tick_carry.
+    A fixed step (dt == 1) is always exactly one tick.
+    """
+    if dt == 1:
+        return 1
+    carry = state.tick_carry + dt
+    whole = int(carry)
+    state.tick_carry = carry - whole
+    return whole
+
+
+def new_seed():
+    """Pick a fresh seed for an interactive round, so it can be replayed."""
+    return random.getrandbits(32)
+
+
+def enable_headless():
+    """Route SDL video and audio to the dummy drivers.
+
+    Must be called before pygame is initialised.
+    """
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+
+def load_game(name):
+    """Import the main module of the game package ``games.<name>``."""
+    return importlib.import_module(f"games.{name}").load()
+
+
+def idle_policy(state):
+    """Bot policy that never presses anything."""
+    return 0
+
+
+def make_random_policy(seed=None, hold=10):
+    """
+    Build a bot policy that holds a random direction for a few ticks.
+
+    Args:
+        seed: Seed for the policy's own RNG, independent of the game's.
+        hold (int): Number of ticks each choice is held for.
+
+    Returns:
+        callable: A policy mapping a state to an action bitmask.
+    """
+    rng = random.Random(seed)
+    current = [0, 0]
+
+    def policy(state):
+        if current[1] <= 0:
+            current[0] = rng.randint(0, ALL_ACTIONS)
+            current[1] = hold
+        current[1] -= 1
+        return current[0]
+
+    return policy
+
+
+def get_policy(game, name, seed=None):
+    """
+    Look up a bot policy by name.
+
+    Args:
+        game: The game module, for its own 'bot' heuristic.
+        name (str): 'idle', 'random' or 'bot'.
+        seed: Seed for the random policy.
+
+    Returns:
+        callable: A policy mapping a state to an action bitmask.
+    """
+    if name == "random":
+        return make_random_policy(seed)
+    if name == "bot":
+        return game.bot_policy
+    return idle_policy
+
+
+def run_headless(game, seed=None, policy=idle_policy, max_frames=100000, **options):
+    """
+    Play one game to completion without rendering.
+
+    Args:
+        game: A game module exposing new_state() and step().
+        seed: Seed for the game's RNG.
+        policy (callable): Maps the current state to an action bitmask.
+        max_frames (int): Upper bound on simulated ticks.
+        **options: Passed on to new_state().
+
+    Returns:
+        The final game state.
+    """
+    state = game.new_state(seed, **options)
+    step = game.step
+    for _ in range(max_frames):
+        if state.game_over:
+            break
+        step(state, policy(state))
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run games headless as fast as possible.")
+    parser.add_argument("game", help="game package name, e.g. shadow_ops")
+    parser.add_argument("--games", type=int, default=100, help="number of games to play")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--policy", choices=POLICIES, default="random")
+    parser.add_argument("--max-frames", type=int, default=100000)
+    args = parser.parse_args()
+
+    enable_headless()
+    game = load_game(args.game)
+
+    frames = 0
+    scores = []
+    start = time.perf_counter()
+    for i in range(args.games):
+        seed = args.seed + i
+        policy = get_policy(game, args.policy, seed)
+        state = run_headless(game, seed, policy, args.max_frames)
+        frames += state.frame
+        scores.append(state.score)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.games} games, {frames} ticks in {elapsed:.2f}s "
+          f"({args.games / elapsed:.1f} games/s, {frames / elapsed:.0f} ticks/s)")
+    print(f"score min {min(scores)} mean {sum(scores) / len(scores):.1f} max {max(scores)}")
+
+
+if __name__ == "__main__":
+    main()
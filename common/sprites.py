@@ -0,0 +1,77 @@
+"""
+Sprite caches for the Arena Blitz games.
+"""
+import pygame
+
+
+class RotationCache:
+    """
+    A sprite pre-rendered at a fixed number of rotation angles.
+
+    Frames are produced by a render callback, either all at once with
+    ``prerender()`` or lazily the first time an angle is drawn, and are
+    shared by every object drawing the same sprite. Drawing a rotated
+    sprite is then a single blit of the nearest frame.
+    """
+
+    def __init__(self, render, steps=72, period=360.0):
+        """
+        Initialize the cache.
+
+        Args:
+            render (callable): Called as render(angle) with an angle in
+                degrees; returns a pygame.Surface with the sprite drawn
+                around the surface's center.
+            steps (int): Number of frames per period, i.e. the angle
+                resolution is period / steps degrees.
+            period (float): Angle after which the sprite looks the same
+                again, e.g. 72 for a five-pointed star.
+        """
+        self.render = render
+        self.steps = steps
+        self.period = period
+        self.frames = [None] * steps
+
+    @classmethod
+    def from_surface(cls, surface, steps=72, period=360.0):
+        """Build a cache that rotates an existing surface with rotozoom."""
+        return cls(lambda angle: pygame.transform.rotozoom(surface, -angle, 1), steps, period)
+
+    def index(self, angle):
+        """Return the frame index nearest to angle (degrees)."""
+        return int(round(angle % self.period * self.steps / self.period)) % self.steps
+
+    def frame(self, angle):
+        """
+        Get the frame nearest to angle, rendering it on first use.
+
+        Args:
+            angle (float): The rotation in degrees.
+
+        Returns:
+            pygame.Surface: The shared frame. Treat it as read-only.
+        """
+        i = self.index(angle)
+        frame = self.frames[i]
+        if frame is None:
+            frame = self.render(i * self.period / self.steps)
+            if pygame.display.get_surface() is not None:
+                frame = frame.convert_alpha()
+            self.frames[i] = frame
+        return frame
+
+    def prerender(self):
+        """Render every frame up front."""
+        for i in range(self.steps):
+            self.frame(i * self.period / self.steps)
+
+    def blit(self, surface, angle, center):
+        """
+        Draw the sprite rotated by angle, centered on center.
+
+        Returns:
+            pygame.Rect: The area drawn to.
+        """
+        frame = self.frame(angle)
+        width, height = frame.get_size()
+        return surface.blit(frame, (center[0] - width // 2, center[1] - height // 2))
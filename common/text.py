@@ -0,0 +1,212 @@
+"""
+Text rendering helpers for the Arena Blitz game launcher and games.
+
+Constructing fonts and rasterizing strings are the slowest things a frame
+loop can do with text, so this module keeps both out of it:
+
+- ``get_font`` loads each font once and hands the same object back.
+- ``TextCache`` keeps recently rendered strings as surfaces (LRU).
+- ``GlyphAtlas`` rasterizes every glyph of a font once and draws strings
+  that change every frame, such as scores, as a batch of glyph blits.
+"""
+import string
+from collections import OrderedDict
+
+import pygame
+
+_fonts = {}
+
+
+def get_font(name, size, bold=False, italic=False):
+    """
+    Get a system font, creating it on first use.
+
+    Args:
+        name (str): The system font name, e.g. 'Arial'.
+        size (int): The size of the font.
+        bold (bool): Whether to use the bold variant.
+        italic (bool): Whether to use the italic variant.
+
+    Returns:
+        pygame.font.Font: The shared font object.
+    """
+    key = ("sys", name, size, bold, italic)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.SysFont(name, size, bold=bold, italic=italic)
+    return font
+
+
+def get_font_file(path, size):
+    """
+    Get a font loaded from a file, creating it on first use.
+
+    Args:
+        path (str): The path of the font file.
+        size (int): The size of the font.
+
+    Returns:
+        pygame.font.Font: The shared font object.
+    """
+    key = ("file", path, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.Font(path, size)
+    return font
+
+
+class TextCache:
+    """A least-recently-used cache of rendered text surfaces."""
+
+    def __init__(self, max_entries=256):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Number of surfaces kept before the least
+                recently used one is dropped.
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def render(self, font, text, color, antialias=True):
+        """
+        Render text, reusing a cached surface when possible.
+
+        Args:
+            font (pygame.font.Font): The font to use.
+            text (str): The text to render.
+            color (tuple): The color of the text (RGB).
+            antialias (bool): Whether to antialias the text.
+
+        Returns:
+            pygame.Surface: The rendered text. Treat it as read-only.
+        """
+        key = (font, text, tuple(color), antialias)
+        entries = self.entries
+        surface = entries.get(key)
+        if surface is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = entries[key] = font.render(text, antialias, color)
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.entries.clear()
+
+
+text_cache = TextCache()
+
+
+def render_text(font, text, color, antialias=True):
+    """Render text through the shared TextCache."""
+    return text_cache.render(font, text, color, antialias)
+
+
+HUD_CHARS = string.digits + string.ascii_letters + string.punctuation + " "
+
+
+class GlyphAtlas:
+    """
+    One font in one color, rasterized glyph by glyph into a single surface.
+
+    Drawing a string is a single ``Surface.blits`` call over areas of the
+    atlas, so frequently changing strings never reach the rasterizer.
+    Glyphs are placed by their advance width; kerning is not applied,
+    which is invisible for the digits and labels it is meant for.
+    """
+
+    def __init__(self, font, color, chars=HUD_CHARS, antialias=True):
+        """
+        Build the atlas.
+
+        Args:
+            font (pygame.font.Font): The font to use.
+            color (tuple): The color of the text (RGB).
+            chars (str): Characters to rasterize up front. Others are
+                rendered on first use and kept.
+            antialias (bool): Whether to antialias the glyphs.
+        """
+        self.font = font
+        self.color = color
+        self.antialias = antialias
+        self.height = font.get_linesize()
+        self.glyphs = {}
+        self.extra = {}
+
+        chars = "".join(dict.fromkeys(chars))
+        rendered = [(ch, font.render(ch, antialias, color)) for ch in chars]
+        width = sum(glyph.get_width() for _, glyph in rendered)
+        height = max([glyph.get_height() for _, glyph in rendered] + [1])
+        self.surface = pygame.Surface((max(width, 1), height), pygame.SRCALPHA)
+        x = 0
+        for ch, glyph in rendered:
+            # Straight copy onto the transparent atlas, no blending
+            area = self.surface.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            self.glyphs[ch] = (area, self._advance(ch, glyph))
+            x += glyph.get_width()
+
+    def _advance(self, ch, glyph):
+        metrics = self.font.metrics(ch)
+        if metrics and metrics[0] is not None:
+            return metrics[0][4]
+        return glyph.get_width()
+
+    def _extra_glyph(self, ch):
+        entry = self.extra.get(ch)
+        if entry is None:
+            glyph = self.font.render(ch, self.antialias, self.color)
+            entry = self.extra[ch] = (glyph, self._advance(ch, glyph))
+        return entry
+
+    def size(self, text):
+        """Return the (width, height) text would occupy."""
+        width = 0
+        glyphs = self.glyphs
+        for ch in text:
+            entry = glyphs.get(ch) or self._extra_glyph(ch)
+            width += entry[1]
+        return (width, self.height)
+
+    def draw(self, surface, text, x, y, align="topleft"):
+        """
+        Draw text from the atlas.
+
+        Args:
+            surface (pygame.Surface): The surface to draw on.
+            text (str): The text to draw.
+            x (int): The x coordinate.
+            y (int): The y coordinate.
+            align (str): The alignment of the text ('topleft', 'center', etc.).
+
+        Returns:
+            pygame.Rect: The area drawn to.
+        """
+        rect = pygame.Rect((0, 0), self.size(text))
+        setattr(rect, align, (x, y))
+        pen = rect.x
+        top = rect.y
+        atlas = self.surface
+        glyphs = self.glyphs
+        blits = []
+        for ch in text:
+            entry = glyphs.get(ch)
+            if entry is not None:
+                area, advance = entry
+                blits.append((atlas, (pen, top), area))
+            else:
+                glyph, advance = self._extra_glyph(ch)
+                blits.append((glyph, (pen, top)))
+            pen += advance
+        surface.blits(blits, doreturn=False)
+        return rect
@@ -3,12 +3,18 @@ Utility functions for the Arena Blitz game launcher and games.
 """
 import os
 import pygame
-from .settings import FONTS_DIR, IMAGES_DIR, SOUNDS_DIR
+from .assets import assets
+from .loader import loader
+from .settings import FONTS_DIR, IMAGES_DIR, SOUNDS_DIR, get_game_assets_dir
+from .text import get_font, get_font_file, render_text
 
 def load_image(filename, scale=1.0, convert_alpha=True):
     """
     Load an image from the images directory.
     
+    Images are cached by the shared AssetManager, so repeated calls return
+    the same surface; treat it as read-only.
+    
     Args:
         filename (str): The filename of the image to load.
         scale (float): Scale factor to resize the image.
@@ -17,28 +23,15 @@ def load_image(filename, scale=1.0, convert_alpha=True):
     Returns:
         pygame.Surface: The loaded image.
     """
-    path = os.path.join(IMAGES_DIR, filename)
-    try:
-        if convert_alpha:
-            image = pygame.image.load(path).convert_alpha()
-        else:
-            image = pygame.image.load(path).convert()
-            
-        if scale != 1.0:
-            new_size = (int(image.get_width() * scale), int(image.get_height() * scale))
-            image = pygame.transform.scale(image, new_size)
-        return image
-    except pygame.error as e:
-        print(f"Error loading image {path}: {e}")
-        # Return a placeholder surface
-        surf = pygame.Surface((50, 50))
-        surf.fill((255, 0, 255))  # Magenta for missing textures
-        return surf
+    return assets.image(os.path.join(IMAGES_DIR, filename), scale, convert_alpha)
 
 def load_game_image(game_name, filename, scale=1.0, convert_alpha=True):
     """
     Load an image from a specific game's images directory.
     
+    Images are cached by the shared AssetManager, so repeated calls return
+    the same surface; treat it as read-only.
+    
     Args:
         game_name (str): The name of the game folder.
         filename (str): The filename of the image to load.
@@ -48,45 +41,29 @@ def load_game_image(game_name, filename, scale=1.0, convert_alpha=True):
     Returns:
         pygame.Surface: The loaded image.
     """
-    from .settings import BASE_DIR
-    path = os.path.join(BASE_DIR, "games", game_name, "assets", "images", filename)
-    try:
-        if convert_alpha:
-            image = pygame.image.load(path).convert_alpha()
-        else:
-            image = pygame.image.load(path).convert()
-            
-        if scale != 1.0:
-            new_size = (int(image.get_width() * scale), int(image.get_height() * scale))
-            image = pygame.transform.scale(image, new_size)
-        return image
-    except pygame.error as e:
-        print(f"Error loading image {path}: {e}")
-        # Return a placeholder surface
-        surf = pygame.Surface((50, 50))
-        surf.fill((255, 0, 255))  # Magenta for missing textures
-        return surf
+    path = os.path.join(get_game_assets_dir(game_name), "images", filename)
+    return assets.image(path, scale, convert_alpha)
 
 def load_sound(filename):
     """
     Load a sound from the sounds directory.
     
+    Sounds are decoded once and shared, so repeated calls return the same
+    object. To play effects on the pooled channels, register them with
+    common.audio instead.
+    
     Args:
         filename (str): The filename of the sound to load.
         
     Returns:
-        pygame.mixer.Sound: The loaded sound.
+        pygame.mixer.Sound: The loaded sound, or None without a mixer.
     """
-    path = os.path.join(SOUNDS_DIR, filename)
-    try:
-        return pygame.mixer.Sound(path)
-    except pygame.error as e:
-        print(f"Error loading sound {path}: {e}")
-        return None
+    return loader.sound(os.path.join(SOUNDS_DIR, filename)).result()
 
 def load_font(filename, size):
     """
-    Load a font from the fonts directory.
+    Load a font from the fonts directory. Each (filename, size) is only
+    loaded once.
     
     Args:
         filename (str): The filename of the font to load.
@@ -97,14 +74,15 @@ def load_font(filename, size):
     """
     path = os.path.join(FONTS_DIR, filename)
     try:
-        return pygame.font.Font(path, size)
-    except pygame.error as e:
+        return get_font_file(path, size)
+    except (pygame.error, OSError) as e:
         print(f"Error loading font {path}: {e}")
-        return pygame.font.SysFont('arial', size)
+        return get_font('arial', size)
 
 def draw_text(surface, text, font, color, x, y, align="topleft"):
     """
-    Draw text on a surface with alignment options.
+    Draw text on a surface with alignment options. Rendered strings are
+    cached, so redrawing unchanged text every frame is just a blit.
     
     Args:
         surface (pygame.Surface): The surface to draw on.
@@ -115,7 +93,7 @@ def draw_text(surface, text, font, color, x, y, align="topleft"):
         y (int): The y coordinate.
         align (str): The alignment of the text ('topleft', 'center', etc.).
     """
-    text_surface = font.render(text, True, color)
+    text_surface = render_text(font, text, color)
     text_rect = text_surface.get_rect()
     setattr(text_rect, align, (x, y))
     surface.blit(text_surface, text_rect)
@@ -160,7 +138,7 @@ class Button:
         color = self.hover_color if self.is_hovered else self.bg_color
         pygame.draw.rect(surface, color, self.rect, border_radius=self.border_radius)
         
-        text_surf = self.font.render(self.text, True, self.text_color)
+        text_surf = render_text(self.font, self.text, self.text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
         
@@ -0,0 +1,13 @@
+"""
+Cyber Ninja Assault - Action Game
+
+Launcher manifest. Importing this package has no side effects; the game
+itself lives in main.py and is only imported by load().
+"""
+TITLE = "Cyber Ninja Assault"
+ORDER = 0
+
+
+def load():
+    from . import main
+    return main
@@ -9,191 +9,466 @@ import sys
 import os
 import math
 
-# Initialize Pygame
-pygame.init()
+# Allow running this file directly as well as through the launcher
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from common import draw
+from common.ai import ChaseAI
+from common.assets import assets
+from common.audio import audio
+from common.collision import SpatialHash
+from common.dirty import FULL_RENDERER, make_renderer
+from common.input import InputReader
+from common.loader import loader
+from common.particles import ParticleStyle, ParticleSystem
+from common.pool import Pool, freeze_heap
+from common.profiler import profiler
+from common.replay import start_recording
+from common.runtime import Runtime
+from common.scheduler import ACTIVE, STATIC, FrameScheduler
+from common.scores import scores
+from common.settings import RECORD_REPLAYS, get_game_assets_dir
+from common.simulation import (ACTION_DOWN, ACTION_LEFT, ACTION_RIGHT, ACTION_UP,
+                               new_seed, whole_ticks)
+from common.sprites import RotationCache
+from common.text import GlyphAtlas, get_font, render_text
 
 # Constants
 WIDTH, HEIGHT = 800, 600
+LOGICAL_SIZE = (WIDTH, HEIGHT)  # what render() draws at, scaled to the window
 PLAYER_COLOR = (0, 255, 200)
 ENEMY_COLOR = (255, 80, 80)
 STAR_COLOR = (255, 0, 0)  # Thick red stars
 FONT_COLOR = (0, 255, 200)
 UI_COLOR = (180, 180, 180)
-FONT = pygame.font.SysFont('Arial', 36)
-SMALL_FONT = pygame.font.SysFont('Arial', 24)
 PLAYER_SIZE = 50
 ENEMY_SIZE = 50
 STAR_SIZE = 30
 SPEED = 5
 ENEMY_SPEED_BASE = 2
+ENEMY_SPEED_RAMP = 0.2  # added every level
+ENEMY_SPEED_CAP = SPEED - 0.5  # enemies never outrun the player
 FPS = 60
-MAX_ENEMIES = 5
+MAX_ENEMIES = 5  # crowds up to this size are all steered every tick
 STAR_COUNT = 3
+STAR_ROTATION_STEPS = 36  # frames per 72 degrees, i.e. 2 degree resolution
+ARENA = pygame.Rect(0, 0, WIDTH, HEIGHT)
+
+# Background image, loaded and converted on first draw
+BG_IMAGE = os.path.join(get_game_assets_dir("cyber_ninja_assault"), "images", "bg.png")
+
+# Sound effects by name: (file, priority, max voices). Missing files are
+# skipped, so the game runs silently without them.
+SOUNDS_DIR = os.path.join(get_game_assets_dir("cyber_ninja_assault"), "sounds")
+SOUNDS = {
+    "cyber.pickup": ("pickup.wav", 1, 3),
+    "cyber.level_up": ("level_up.wav", 2, 1),
+    "cyber.game_over": ("game_over.wav", 3, 1),
+}
+
+# Fonts are created by preload(), not at import time
+FONT = None
+SMALL_FONT = None
+# HUD counters change every frame, so they are drawn from a glyph atlas
+HUD = None
+# (background image, copy with the static text drawn on it), see background()
+BACKGROUND = None
 
-# Load background image
-bg_image = pygame.image.load("games/cyber_ninja_assault/assets/images/bg.png")
-bg_image = pygame.transform.scale(bg_image, (WIDTH, HEIGHT))
+def preload():
+    """
+    Create fonts and start streaming assets; safe to call from a worker thread.
 
-# Setup display
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Cyber Ninja Assault")
-clock = pygame.time.Clock()
+    Returns:
+        list: Futures of the asset loads still in flight.
+    """
+    global FONT, SMALL_FONT, HUD
+    if HUD is None:
+        pygame.font.init()
+        FONT = get_font('Arial', 36)
+        SMALL_FONT = get_font('Arial', 24)
+        HUD = GlyphAtlas(SMALL_FONT, UI_COLOR)
+    futures = [loader.image(BG_IMAGE, (WIDTH, HEIGHT), alpha=False)]
+    for name, (filename, priority, max_voices) in SOUNDS.items():
+        future = audio.register(name, os.path.join(SOUNDS_DIR, filename), priority, max_voices)
+        if future is not None:
+            futures.append(future)
+    return futures
 
 def draw_text(text, font, color, surface, x, y, center=False):
-    rendered = font.render(text, True, color)
+    rendered = render_text(font, text, color)
     rect = rendered.get_rect()
     if center:
         rect.center = (x, y)
     else:
         rect.topleft = (x, y)
-    surface.blit(rendered, rect)
+    return surface.blit(rendered, rect)
+
+def render_star(angle):
+    # Draw a 5-pointed star with thick red color
+    half = STAR_SIZE // 2 + 2  # room for the outline
+    surface = pygame.Surface((half * 2, half * 2), pygame.SRCALPHA)
+    points = []
+    for i in range(10):
+        radius = STAR_SIZE/2 if i % 2 == 0 else STAR_SIZE/4
+        point_angle = math.pi/5 * i + math.radians(angle)
+        points.append((
+            half + radius * math.sin(point_angle),
+            half - radius * math.cos(point_angle)
+        ))
+    pygame.draw.polygon(surface, STAR_COLOR, points)
+    # Add outline to make it look thicker
+    pygame.draw.polygon(surface, STAR_COLOR, points, 3)
+    return surface
+
+# Stars look the same every 72 degrees; every star shares these frames
+STAR_SPRITES = RotationCache(render_star, steps=STAR_ROTATION_STEPS, period=72)
+
+# The angry face sticks out above and left of the enemy's box
+ENEMY_MARGIN = ENEMY_SIZE // 4
+
+# Built by enemy_sprite() on first draw, not at import time
+ENEMY_SPRITE = None
+
+def enemy_sprite():
+    """A red box with an angry face, drawn once and blitted for every enemy."""
+    global ENEMY_SPRITE
+    if ENEMY_SPRITE is None:
+        ENEMY_SPRITE = render_enemy()
+    return ENEMY_SPRITE
+
+def render_enemy():
+    offset = ENEMY_MARGIN
+    size = ENEMY_SIZE + offset
+    surface = pygame.Surface((size, size))
+    surface.fill((255, 0, 255))
+    surface.set_colorkey((255, 0, 255), pygame.RLEACCEL)
+    pygame.draw.rect(surface, ENEMY_COLOR, (offset, offset, ENEMY_SIZE, ENEMY_SIZE))
+    # Angry eyes
+    eye_size = ENEMY_SIZE // 8
+    pygame.draw.rect(surface, (0, 0, 0), (offset - ENEMY_SIZE//4, offset - ENEMY_SIZE//4, eye_size, eye_size))
+    pygame.draw.rect(surface, (0, 0, 0), (offset + ENEMY_SIZE//8, offset - ENEMY_SIZE//4, eye_size, eye_size))
+    # Angry mouth
+    pygame.draw.line(surface, (0, 0, 0),
+                     (offset - ENEMY_SIZE//4, offset + ENEMY_SIZE//4),
+                     (offset + ENEMY_SIZE//4, offset + ENEMY_SIZE//4), 3)
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert()
+    return surface
+
+# Effects, drawn over the scene by run()
+PICKUP_SPARKS = ParticleStyle(STAR_COLOR, 3, life=30, drag=0.92, gravity=0.05)
+PICKUP_PARTICLES = 24  # per star
+ENEMY_TRAIL = ParticleStyle(ENEMY_COLOR, 4, life=16)
+TRAIL_INTERVAL = 3  # ticks between an enemy's trail particles
+DASH_TRAIL = ParticleStyle(PLAYER_COLOR, 6, life=10)
 
 class Star:
-    def __init__(self):
-        self.x = random.randint(STAR_SIZE, WIDTH - STAR_SIZE)
-        self.y = random.randint(STAR_SIZE, HEIGHT - STAR_SIZE)
+    # Stars are recycled through a Pool on every level-up
+    __slots__ = ("x", "y", "size", "collected", "points", "angle", "rect")
+
+    def __init__(self, rng=None):
         self.size = STAR_SIZE
-        self.collected = False
         self.points = 50
+        self.rect = pygame.Rect(0, 0, self.size, self.size)
+        if rng is not None:
+            self.reset(rng)
+
+    def reset(self, rng=random):
+        """Place the star at a new random spot, uncollected."""
+        self.x = rng.randint(STAR_SIZE, WIDTH - STAR_SIZE)
+        self.y = rng.randint(STAR_SIZE, HEIGHT - STAR_SIZE)
+        self.collected = False
         self.angle = 0
-    
+        self.rect.center = (self.x, self.y)
+
     def draw(self, surface):
         if not self.collected:
-            # Draw a 5-pointed star with thick red color
-            self.angle += 0.5
-            points = []
-            for i in range(10):
-                radius = self.size/2 if i % 2 == 0 else self.size/4
-                angle = math.pi/5 * i + math.radians(self.angle)
-                points.append((
-                    self.x + radius * math.sin(angle),
-                    self.y - radius * math.cos(angle)
-                ))
-            pygame.draw.polygon(surface, STAR_COLOR, points)
-            # Add outline to make it look thicker
-            pygame.draw.polygon(surface, STAR_COLOR, points, 3)
-
-def run():
-    player = pygame.Rect(WIDTH//2, HEIGHT//2, PLAYER_SIZE, PLAYER_SIZE)
-    enemies = [pygame.Rect(random.randint(0, WIDTH-ENEMY_SIZE), 
-                          random.randint(0, HEIGHT-ENEMY_SIZE), 
-                          ENEMY_SIZE, ENEMY_SIZE)]  # Only one enemy
-    
-    stars = [Star() for _ in range(STAR_COUNT)]
-    collected_stars = 0
-    total_stars = 0
-    
-    score = 0
-    game_over = False
-    level = 1
-    enemy_speed = ENEMY_SPEED_BASE
-
-    while True:
-        keys = pygame.key.get_pressed()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    return
-                if game_over and event.key == pygame.K_r:
-                    return run()
-                elif game_over and event.key == pygame.K_q:
-                    pygame.quit()
-                    sys.exit()
-
-        if not game_over:
-            # Movement
-            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-                player.x -= SPEED
-            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-                player.x += SPEED
-            if keys[pygame.K_UP] or keys[pygame.K_w]:
-                player.y -= SPEED
-            if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-                player.y += SPEED
-
-            # Keep inside screen
-            player.clamp_ip(screen.get_rect())
-
-            # Enemy movement
-            for enemy in enemies:
-                # Enemy follows player
-                if enemy.x < player.x:
-                    enemy.x += enemy_speed
-                elif enemy.x > player.x:
-                    enemy.x -= enemy_speed
-                if enemy.y < player.y:
-                    enemy.y += enemy_speed
-                elif enemy.y > player.y:
-                    enemy.y -= enemy_speed
-
-                # Collision detection with player
-                if player.colliderect(enemy):
-                    game_over = True
-
-            # Check for star collection
-            for star in stars:
-                if not star.collected:
-                    star_rect = pygame.Rect(star.x - star.size/2, star.y - star.size/2, star.size, star.size)
-                    if player.colliderect(star_rect):
-                        star.collected = True
-                        score += star.points
-                        collected_stars += 1
-                        total_stars += 1
-            
-            # If all stars are collected, add more stars but keep only one enemy
-            if all(star.collected for star in stars):
-                level += 1
-                stars = [Star() for _ in range(STAR_COUNT)]
-                # Don't add more enemies, keep just one
-                
-                # Increase enemy speed slightly with each level
-                enemy_speed = min(enemy_speed + 0.2, SPEED - 0.5)  # Cap enemy speed below player speed
-
-            score += 1
-
-        # Drawing
-        screen.blit(bg_image, (0, 0))
-        draw_text("Cyber Ninja Assault", FONT, FONT_COLOR, screen, WIDTH//2, 40, center=True)
-        draw_text(f"Score: {score}", SMALL_FONT, UI_COLOR, screen, 10, 10)
-        draw_text(f"Stars: {collected_stars} (Total: {total_stars})", SMALL_FONT, UI_COLOR, screen, 10, 40)
-        draw_text(f"Level: {level}", SMALL_FONT, UI_COLOR, screen, WIDTH - 100, 10)
-
-        # Draw stars
-        for star in stars:
-            star.draw(screen)
-
-        # Draw player as a ninja character
-        pygame.draw.rect(screen, PLAYER_COLOR, player)
-        # Draw ninja headband
-        pygame.draw.line(screen, (0, 0, 255), 
-                        (player.x - PLAYER_SIZE//2, player.y - PLAYER_SIZE//4),
-                        (player.x + PLAYER_SIZE//2, player.y - PLAYER_SIZE//4), 5)
-        
-        # Draw enemies as red boxes with angry faces
-        for enemy in enemies:
-            pygame.draw.rect(screen, ENEMY_COLOR, enemy)
-            # Draw angry eyes
-            eye_size = ENEMY_SIZE // 8
-            pygame.draw.rect(screen, (0, 0, 0), 
-                           (enemy.x - ENEMY_SIZE//4, enemy.y - ENEMY_SIZE//4, eye_size, eye_size))
-            pygame.draw.rect(screen, (0, 0, 0), 
-                           (enemy.x + ENEMY_SIZE//8, enemy.y - ENEMY_SIZE//4, eye_size, eye_size))
-            # Draw angry mouth
-            pygame.draw.line(screen, (0, 0, 0), 
-                           (enemy.x - ENEMY_SIZE//4, enemy.y + ENEMY_SIZE//4),
-                           (enemy.x + ENEMY_SIZE//4, enemy.y + ENEMY_SIZE//4), 3)
-
-        if game_over:
-            draw_text("Game Over", FONT, (255, 0, 0), screen, WIDTH//2, HEIGHT//2 - 50, center=True)
-            draw_text(f"Final Score: {score}", FONT, (255, 255, 255), screen, WIDTH//2, HEIGHT//2, center=True)
-            draw_text("Press R to Restart or Q to Quit", SMALL_FONT, UI_COLOR, screen, WIDTH//2, HEIGHT//2 + 50, center=True)
-
-        draw_text("Use arrow keys or WASD to move. ESC to return to launcher.", SMALL_FONT, UI_COLOR, screen, WIDTH//2, HEIGHT - 30, center=True)
-        pygame.display.flip()
-        clock.tick(FPS)
+            return STAR_SPRITES.blit(surface, self.angle, (self.x, self.y))
+        return None
+
+class GameState:
+    """Everything a round of Cyber Ninja Assault needs to be simulated."""
+
+    def __init__(self, seed=None, enemy_count=1, star_count=STAR_COUNT,
+                 enemy_speed=ENEMY_SPEED_BASE, speed_ramp=ENEMY_SPEED_RAMP, speed_cap=ENEMY_SPEED_CAP):
+        self.rng = random.Random(seed)
+        self.star_count = star_count
+        self.speed_ramp = speed_ramp
+        self.speed_cap = speed_cap
+        self.player = pygame.Rect(WIDTH//2, HEIGHT//2, PLAYER_SIZE, PLAYER_SIZE)
+        self.enemies = [pygame.Rect(self.rng.randint(0, WIDTH-ENEMY_SIZE),
+                                    self.rng.randint(0, HEIGHT-ENEMY_SIZE),
+                                    ENEMY_SIZE, ENEMY_SIZE)
+                        for _ in range(enemy_count)]  # Only one enemy by default
+        self.star_pool = Pool(Star, star_count)
+        self.stars = [self.star_pool.acquire(self.rng) for _ in range(star_count)]
+        # Bigger crowds are steered with distance-based level of detail
+        self.ai = ChaseAI(self.enemies, full_rate=MAX_ENEMIES)
+        self.hits = []  # reused by the per-tick pickup queries
+        # Broad-phase grid for the player's star pickups
+        self.star_grid = SpatialHash()
+        for star in self.stars:
+            self.star_grid.insert(star, star.rect)
+        self.collected_stars = 0
+        self.total_stars = 0
+        self.score = 0
+        self.game_over = False
+        self.level = 1
+        self.enemy_speed = enemy_speed
+        self.frame = 0
+        self.tick_carry = 0
+
+def new_state(seed=None, **options):
+    """Start a round; options override the counts and speed tunables of GameState."""
+    return GameState(seed, **options)
+
+def step(state, inputs, dt=1):
+    """Advance the simulation by one fixed tick, or by dt ticks."""
+    spin = 0.5 * dt
+    for star in state.stars:
+        star.angle += spin
+
+    if state.game_over:
+        return
+
+    ticks = whole_ticks(state, dt)
+    state.frame += ticks
+    player = state.player
+
+    # Movement
+    distance = round(SPEED * dt)
+    if inputs & ACTION_LEFT:
+        player.x -= distance
+    if inputs & ACTION_RIGHT:
+        player.x += distance
+    if inputs & ACTION_UP:
+        player.y -= distance
+    if inputs & ACTION_DOWN:
+        player.y += distance
+
+    # Keep inside screen
+    player.clamp_ip(ARENA)
+
+    # Enemies follow the player
+    with profiler.phase("ai"):
+        state.ai.update(player.topleft, state.enemy_speed * dt)
+
+    with profiler.phase("collision"):
+        # Collision detection with player
+        if state.ai.overlaps(player):
+            state.game_over = True
+        pickups = state.star_grid.query_pairs((("player", player),), state.hits)
+
+    # Check for star collection
+    for _, star in pickups:
+        star.collected = True
+        state.star_grid.remove(star)
+        state.score += star.points
+        state.collected_stars += 1
+        state.total_stars += 1
+
+    # If all stars are collected, add more stars but keep only one enemy
+    if not state.star_grid:
+        state.level += 1
+        stars = state.stars
+        state.star_pool.release_all(stars)
+        stars.clear()
+        for _ in range(state.star_count):
+            star = state.star_pool.acquire(state.rng)
+            stars.append(star)
+            state.star_grid.insert(star, star.rect)
+        # Don't add more enemies, keep just one
+
+        # Increase enemy speed slightly with each level
+        state.enemy_speed = min(state.enemy_speed + state.speed_ramp, state.speed_cap)
+
+    state.score += ticks
+
+def bot_policy(state):
+    """Self-play heuristic: head for the nearest star, back off from close enemies."""
+    px, py = state.player.center
+    target = None
+    best = None
+    for enemy in state.enemies:
+        distance = abs(enemy.centerx - px) + abs(enemy.centery - py)
+        if distance < 150 and (best is None or distance < best):
+            best = distance
+            # The point opposite the enemy, pulled towards the middle of the
+            # arena so the bot circles in open space instead of fleeing into
+            # a wall or corner where the enemy catches it
+            target = (2 * px - enemy.centerx + (ARENA.centerx - px) // 4,
+                      2 * py - enemy.centery + (ARENA.centery - py) // 4)
+    if target is None:
+        for star in state.stars:
+            if star.collected:
+                continue
+            distance = abs(star.x - px) + abs(star.y - py)
+            if best is None or distance < best:
+                best = distance
+                target = (star.x, star.y)
+    if target is None:
+        return 0
+
+    inputs = 0
+    if target[0] < px - SPEED:
+        inputs |= ACTION_LEFT
+    elif target[0] > px + SPEED:
+        inputs |= ACTION_RIGHT
+    if target[1] < py - SPEED:
+        inputs |= ACTION_UP
+    elif target[1] > py + SPEED:
+        inputs |= ACTION_DOWN
+    return inputs
+
+def background():
+    """The backdrop with the static title and help text baked in."""
+    global BACKGROUND
+    image = assets.image(BG_IMAGE, (WIDTH, HEIGHT), alpha=False)
+    if BACKGROUND is None or BACKGROUND[0] is not image:
+        layer = image.copy()
+        draw_text("Cyber Ninja Assault", FONT, FONT_COLOR, layer, WIDTH//2, 40, center=True)
+        draw_text("Use arrow keys or WASD to move. ESC to return to launcher.", SMALL_FONT, UI_COLOR, layer, WIDTH//2, HEIGHT - 30, center=True)
+        BACKGROUND = (image, layer)
+    return BACKGROUND[1]
+
+def render(surface, state, renderer=FULL_RENDERER):
+    """
+    Draw the current state; never mutates it.
+
+    Args:
+        surface (pygame.Surface): The surface to draw on.
+        state (GameState): The state to draw.
+        renderer: A DirtyRenderer to repaint only what changed; by default
+            the whole frame is repainted.
+    """
+    player = state.player
+    mark = renderer.add
+
+    renderer.restore(surface, background())
+    with profiler.phase("text"):
+        mark(HUD.draw(surface, f"Score: {state.score}", 10, 10))
+        mark(HUD.draw(surface, f"Stars: {state.collected_stars} (Total: {state.total_stars})", 10, 40))
+        mark(HUD.draw(surface, f"Level: {state.level}", WIDTH - 100, 10))
+
+    # Draw stars
+    for star in state.stars:
+        mark(star.draw(surface))
+
+    # Draw player as a ninja character
+    mark(draw.rect(surface, PLAYER_COLOR, player))
+    # Draw ninja headband
+    mark(draw.line(surface, (0, 0, 255),
+                  (player.x - PLAYER_SIZE//2, player.y - PLAYER_SIZE//4),
+                  (player.x + PLAYER_SIZE//2, player.y - PLAYER_SIZE//4), 5))
+
+    # Draw enemies as red boxes with angry faces, in one batch
+    with profiler.phase("enemies"):
+        sprite = enemy_sprite()
+        for rect in surface.blits([(sprite, (enemy.x - ENEMY_MARGIN, enemy.y - ENEMY_MARGIN))
+                                   for enemy in state.enemies]):
+            mark(rect)
+
+    with profiler.phase("text"):
+        if state.game_over:
+            mark(draw_text("Game Over", FONT, (255, 0, 0), surface, WIDTH//2, HEIGHT//2 - 50, center=True))
+            mark(draw_text(f"Final Score: {state.score}", FONT, (255, 255, 255), surface, WIDTH//2, HEIGHT//2, center=True))
+            mark(draw_text("Press R to Restart or Q to Quit", SMALL_FONT, UI_COLOR, surface, WIDTH//2, HEIGHT//2 + 50, center=True))
+
+def run(ctx=None):
+    """
+    Play the game until the player leaves it.
+
+    Args:
+        ctx (Runtime): The shared display context from the launcher. A
+            window of the game's own size is opened when omitted.
+    """
+    standalone = ctx is None
+    if standalone:
+        ctx = Runtime(LOGICAL_SIZE, "Cyber Ninja Assault")
+    preload()
+
+    screen = ctx.begin(LOGICAL_SIZE, "Cyber Ninja Assault")
+    scheduler = FrameScheduler(ctx.clock)
+    renderer = make_renderer()
+    controls = InputReader(ctx)
+    effects = ParticleSystem()
+
+    seed = new_seed()
+    state = new_state(seed)
+    scores.load()
+    if standalone:
+        # The launcher freezes its heap once at startup; freezing again on
+        # every launch would pin each session's leftovers for good
+        freeze_heap()
+    # Variable steps are not deterministic, so they cannot be replayed
+    recorder = start_recording("cyber_ninja_assault", enabled=RECORD_REPLAYS and not scheduler.variable)
+    recorder.start_round(seed)
+    try:
+        while True:
+            # Nothing moves on the game over screen, so refresh it slowly
+            scheduler.mode = STATIC if state.game_over else ACTIVE
+            events = scheduler.wait()
+            profiler.begin_frame()
+
+            with profiler.phase("input"):
+                frame_input = controls.poll(events)
+                if frame_input.quit:
+                    ctx.quit()
+                if frame_input.resized:
+                    # The scene may now draw on another buffer
+                    screen = ctx.surface
+                if frame_input.resized or frame_input.exposed:
+                    renderer.invalidate()
+                for key in frame_input.keys:
+                    if key == pygame.K_ESCAPE:
+                        return
+                    if state.game_over:
+                        if key == pygame.K_r:
+                            seed = new_seed()
+                            state = new_state(seed)
+                            effects.clear()
+                            recorder.start_round(seed)
+                        elif key == pygame.K_q:
+                            return
+                inputs = frame_input.actions
+
+            with profiler.phase("update"):
+                stars, level, game_over = state.total_stars, state.level, state.game_over
+                frame, position = state.frame, state.player.center
+                steps, dt = scheduler.advance()
+                for _ in range(steps):
+                    recorder.tick(inputs)
+                    step(state, inputs, dt)
+                # Sounds, effects and scores are handled here, outside the
+                # pure simulation
+                effects.update(steps * dt)
+                if state.player.center != position:
+                    effects.emit(DASH_TRAIL, (position[0],), (position[1],))
+                if state.frame // TRAIL_INTERVAL != frame // TRAIL_INTERVAL:
+                    half = ENEMY_SIZE / 2
+                    effects.emit(ENEMY_TRAIL, state.ai.x + half, state.ai.y + half, jitter=0.3)
+                if state.total_stars > stars:
+                    effects.burst(PICKUP_SPARKS, state.player.center, PICKUP_PARTICLES * (state.total_stars - stars))
+                    audio.play("cyber.pickup")
+                if state.level > level:
+                    audio.play("cyber.level_up")
+                if state.game_over and not game_over:
+                    audio.play("cyber.game_over")
+                    scores.submit("cyber_ninja_assault", state.score, level=state.level, ticks=state.frame, seed=seed)
+
+            with profiler.phase("draw"):
+                render(screen, state, renderer)
+                for rect in effects.draw(screen):
+                    renderer.add(rect)
+                renderer.add(profiler.draw_overlay(screen))
+
+            with profiler.phase("flip"):
+                renderer.present(ctx)
+            profiler.end_frame()
+    finally:
+        recorder.close()
+
 
 if __name__ == "__main__":
     run()
@@ -0,0 +1,13 @@
+"""
+Shadow Ops - Dodge Game
+
+Launcher manifest. Importing this package has no side effects; the game
+itself lives in main.py and is only imported by load().
+"""
+TITLE = "Shadow Ops"
+ORDER = 1
+
+
+def load():
+    from . import main
+    return main
@@ -1,131 +1,399 @@
-import pygame
-import random
-import sys
-import os
-
-# Initialize Pygame
-pygame.init()
-
-# Screen settings
-SCREEN_WIDTH = 800
-SCREEN_HEIGHT = 600
-FPS = 60
-
-# Colors
-BLACK = (10, 10, 30)
-GREEN = (0, 255, 180)
-RED = (255, 60, 60)
-WHITE = (255, 255, 255)
-
-# Setup screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Shadow Ops")
-clock = pygame.time.Clock()
-font = pygame.font.SysFont('Arial', 28)
-
-# Load background image
-bg_image = pygame.image.load("games/shadow_ops/assets/images/bg.png")
-bg_image = pygame.transform.scale(bg_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
-
-# Player setup
-player_size = (50, 50)
-player = pygame.Rect(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 60, *player_size)
-player_speed = 7
-
-# Enemy setup
-enemy_size = (50, 50)
-enemies = []
-enemy_spawn_rate = 30  # lower = faster spawns
-base_enemy_speed = 4
-
-# Score
-score = 0
-
-
-def draw_text(text, size, color, x, y, align="topleft"):
-    font = pygame.font.SysFont('Arial', size)
-    surface = font.render(text, True, color)
-    rect = surface.get_rect()
-    setattr(rect, align, (x, y))
-    screen.blit(surface, rect)
-
-
-def spawn_enemy():
-    x = random.randint(0, SCREEN_WIDTH - enemy_size[0])
-    enemy = pygame.Rect(x, -enemy_size[1], *enemy_size)
-    enemies.append(enemy)
-
-
-def reset_game():
-    global enemies, score, player
-    enemies = []
-    score = 0
-    player.x = SCREEN_WIDTH // 2
-
-
-def run():
-    global score
-    frame = 0
-    running = True
-    game_over = False
-
-    while True:
-        clock.tick(FPS)
-        screen.blit(bg_image, (0, 0))
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
-                if game_over:
-                    if event.key == pygame.K_r:
-                        reset_game()
-                        game_over = False
-                        running = True
-                        frame = 0
-                    elif event.key == pygame.K_q:
-                        pygame.quit()
-                        sys.exit()
-
-        if running:
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-                player.x -= player_speed
-            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-                player.x += player_speed
-            player.x = max(0, min(player.x, SCREEN_WIDTH - player.width))
-
-            frame += 1
-            if frame % enemy_spawn_rate == 0:
-                spawn_enemy()
-
-            current_enemy_speed = base_enemy_speed + (score // 1000) * 0.5
-
-            for enemy in enemies[:]:
-                enemy.y += current_enemy_speed
-                if enemy.top > SCREEN_HEIGHT:
-                    enemies.remove(enemy)
-                elif enemy.colliderect(player):
-                    game_over = True
-                    running = False
-                else:
-                    pygame.draw.rect(screen, RED, enemy)
-
-            pygame.draw.rect(screen, GREEN, player)
-
-            score += 1
-            draw_text(f"Score: {score}", 24, WHITE, 10, 10)
-
-        else:
-            draw_text("Game Over", 40, RED, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50, align="center")
-            draw_text("Press R to Restart or Q to Quit", 24, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 10, align="center")
-
-        pygame.display.flip()
-
-
-if __name__ == "__main__":
-    run()
+import numpy as np
+import pygame
+import random
+import sys
+import os
+
+# Allow running this file directly as well as through the launcher
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from common import draw
+from common.assets import assets
+from common.audio import audio
+from common.dirty import FULL_RENDERER, make_renderer
+from common.input import InputReader
+from common.loader import loader
+from common.particles import ParticleStyle, ParticleSystem
+from common.pool import freeze_heap
+from common.profiler import profiler
+from common.replay import start_recording
+from common.runtime import Runtime
+from common.scheduler import ACTIVE, STATIC, FrameScheduler
+from common.scores import scores
+from common.settings import RECORD_REPLAYS, get_game_assets_dir
+from common.simulation import ACTION_LEFT, ACTION_RIGHT, new_seed, whole_ticks
+from common.text import GlyphAtlas, get_font, render_text
+
+# Screen settings
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+LOGICAL_SIZE = (SCREEN_WIDTH, SCREEN_HEIGHT)  # what render() draws at, scaled to the window
+FPS = 60
+
+# Colors
+BLACK = (10, 10, 30)
+GREEN = (0, 255, 180)
+RED = (255, 60, 60)
+WHITE = (255, 255, 255)
+
+# Background image, loaded and converted on first draw
+BG_IMAGE = os.path.join(get_game_assets_dir("shadow_ops"), "images", "bg.png")
+
+# Sound effects by name: (file, priority, max voices). Missing files are
+# skipped, so the game runs silently without them.
+SOUNDS_DIR = os.path.join(get_game_assets_dir("shadow_ops"), "sounds")
+SOUNDS = {
+    "shadow.speed_up": ("speed_up.wav", 1, 1),
+    "shadow.game_over": ("game_over.wav", 3, 1),
+}
+
+# Effects, drawn over the scene by run()
+DASH_TRAIL = ParticleStyle(GREEN, 6, life=10)
+CRASH_SPARKS = ParticleStyle(RED, 3, life=40, drag=0.94, gravity=0.1)
+CRASH_PARTICLES = 60
+
+# The score changes every frame, so it is drawn from a glyph atlas
+# built by preload()
+hud = None
+
+# Player setup
+player_size = (50, 50)
+player_speed = 7
+
+# Enemy setup
+enemy_size = (50, 50)
+enemy_spawn_rate = 30  # lower = faster spawns
+base_enemy_speed = 4
+speed_ramp = 0.5  # extra enemy speed per ramp_interval points
+ramp_interval = 1000
+
+
+class EnemyPool:
+    """
+    Structure-of-arrays store for the falling enemies.
+
+    Live enemies are kept packed in the first ``count`` slots of each array,
+    so movement, culling and the player overlap test are one NumPy
+    operation per frame and removal is a single compaction pass. The
+    overlap test writes into preallocated scratch arrays, so a frame
+    allocates no new arrays.
+    """
+
+    def __init__(self, capacity=64):
+        self.width, self.height = enemy_size
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.speed = np.zeros(capacity, dtype=np.float64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.count = 0
+        # Scratch space for overlaps()
+        self.hit = np.zeros(capacity, dtype=bool)
+        self.test = np.zeros(capacity, dtype=bool)
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        capacity = len(self.x) * 2
+        for name in ("x", "y", "speed", "alive", "hit", "test"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def spawn(self, x, y, speed):
+        if self.count == len(self.x):
+            self._grow()
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.speed[i] = speed
+        self.alive[i] = True
+        self.count += 1
+
+    def set_speed(self, speed):
+        self.speed[:self.count] = speed
+
+    def move(self, max_y, dt=1):
+        """
+        Move every enemy down by its speed and flag those below max_y.
+
+        Positions are rounded half away from zero after each move, as
+        assigning a float to pygame.Rect.y does, so fractional speeds
+        play out exactly as they did with Rect enemies.
+        """
+        n = self.count
+        y = self.y[:n]
+        if dt == 1:
+            y += self.speed[:n]
+        else:
+            y += self.speed[:n] * dt
+        np.copysign(np.floor(np.abs(y) + 0.5), y, out=y)
+        np.less_equal(y, max_y, out=self.alive[:n])
+
+    def overlaps(self, rect):
+        """Whether any live enemy intersects rect (same rule as Rect.colliderect)."""
+        n = self.count
+        if n == 0:
+            return False
+        x = self.x[:n]
+        y = self.y[:n]
+        hit = self.hit[:n]
+        test = self.test[:n]
+        np.less(x, rect.right, out=hit)
+        np.greater(x, rect.left - self.width, out=test)
+        hit &= test
+        np.less(y, rect.bottom, out=test)
+        hit &= test
+        np.greater(y, rect.top - self.height, out=test)
+        hit &= test
+        hit &= self.alive[:n]
+        return bool(hit.any())
+
+    def compact(self):
+        """Drop dead enemies, keeping the live ones packed at the front."""
+        n = self.count
+        keep = self.alive[:n]
+        live = int(np.count_nonzero(keep))
+        if live == n:
+            return
+        for array in (self.x, self.y, self.speed):
+            array[:live] = array[:n][keep]
+        self.alive[:live] = True
+        self.count = live
+
+    def rects(self):
+        """Yield (x, y, width, height) for every live enemy."""
+        n = self.count
+        for x, y in zip(self.x[:n].tolist(), self.y[:n].tolist()):
+            yield (x, y, self.width, self.height)
+
+
+class GameState:
+    """Everything a round of Shadow Ops needs to be simulated."""
+
+    def __init__(self, seed=None, spawn_rate=enemy_spawn_rate, base_speed=base_enemy_speed,
+                 speed_ramp=speed_ramp, ramp_interval=ramp_interval):
+        self.rng = random.Random(seed)
+        # Difficulty tunables, overridable for stress runs and sweeps
+        self.spawn_rate = spawn_rate
+        self.base_speed = base_speed
+        self.speed_ramp = speed_ramp
+        self.ramp_interval = ramp_interval
+        self.player = pygame.Rect(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 60, *player_size)
+        self.enemies = EnemyPool()
+        self.enemy_speed = base_speed
+        self.score = 0
+        self.frame = 0
+        self.tick_carry = 0
+        self.game_over = False
+
+
+def new_state(seed=None, **options):
+    """Start a round; options override the difficulty tunables of GameState."""
+    return GameState(seed, **options)
+
+
+def preload():
+    """
+    Create fonts and start streaming assets; safe to call from a worker thread.
+
+    Returns:
+        list: Futures of the asset loads still in flight.
+    """
+    global hud
+    if hud is None:
+        pygame.font.init()
+        get_font('Arial', 40)
+        hud = GlyphAtlas(get_font('Arial', 24), WHITE)
+    futures = [loader.image(BG_IMAGE, (SCREEN_WIDTH, SCREEN_HEIGHT), alpha=False)]
+    for name, (filename, priority, max_voices) in SOUNDS.items():
+        future = audio.register(name, os.path.join(SOUNDS_DIR, filename), priority, max_voices)
+        if future is not None:
+            futures.append(future)
+    return futures
+
+
+def draw_text(surface, text, size, color, x, y, align="topleft"):
+    rendered = render_text(get_font('Arial', size), text, color)
+    rect = rendered.get_rect()
+    setattr(rect, align, (x, y))
+    return surface.blit(rendered, rect)
+
+
+def spawn_enemy(state):
+    x = state.rng.randint(0, SCREEN_WIDTH - enemy_size[0])
+    state.enemies.spawn(x, -enemy_size[1], state.enemy_speed)
+
+
+def step(state, inputs, dt=1):
+    """Advance the simulation by one fixed tick, or by dt ticks."""
+    if state.game_over:
+        return
+
+    player = state.player
+    distance = round(player_speed * dt)
+    if inputs & ACTION_LEFT:
+        player.x -= distance
+    if inputs & ACTION_RIGHT:
+        player.x += distance
+    player.x = max(0, min(player.x, SCREEN_WIDTH - player.width))
+
+    ticks = whole_ticks(state, dt)
+    state.frame += ticks
+    # Spawn whenever the tick count passes a multiple of the spawn rate
+    if state.frame // state.spawn_rate != (state.frame - ticks) // state.spawn_rate:
+        spawn_enemy(state)
+
+    current_enemy_speed = state.base_speed + (state.score // state.ramp_interval) * state.speed_ramp
+    if current_enemy_speed != state.enemy_speed:
+        state.enemy_speed = current_enemy_speed
+        state.enemies.set_speed(current_enemy_speed)
+
+    enemies = state.enemies
+    enemies.move(SCREEN_HEIGHT, dt)
+    with profiler.phase("collision"):
+        if enemies.overlaps(player):
+            state.game_over = True
+    enemies.compact()
+
+    state.score += ticks
+
+
+def bot_policy(state):
+    """Self-play heuristic: sidestep the enemies about to land on the player."""
+    player = state.player
+    enemies = state.enemies
+    n = enemies.count
+    if n:
+        x = enemies.x[:n]
+        danger = ((enemies.y[:n] > player.top - 250) & (enemies.y[:n] < player.bottom)
+                  & (x < player.right + 10) & (x + enemies.width > player.left - 10))
+        if danger.any():
+            threat = float(x[danger].mean()) + enemies.width / 2
+            if player.left <= 0:
+                return ACTION_RIGHT
+            if player.right >= SCREEN_WIDTH:
+                return ACTION_LEFT
+            return ACTION_LEFT if threat > player.centerx else ACTION_RIGHT
+    return 0
+
+
+def render(surface, state, renderer=FULL_RENDERER):
+    """
+    Draw the current state; never mutates it.
+
+    Args:
+        surface (pygame.Surface): The surface to draw on.
+        state (GameState): The state to draw.
+        renderer: A DirtyRenderer to repaint only what changed; by default
+            the whole frame is repainted.
+    """
+    mark = renderer.add
+    renderer.restore(surface, assets.image(BG_IMAGE, (SCREEN_WIDTH, SCREEN_HEIGHT), alpha=False))
+
+    if not state.game_over:
+        for enemy in state.enemies.rects():
+            mark(surface.fill(RED, enemy))
+        mark(draw.rect(surface, GREEN, state.player))
+        with profiler.phase("text"):
+            mark(hud.draw(surface, f"Score: {state.score}", 10, 10))
+    else:
+        with profiler.phase("text"):
+            mark(draw_text(surface, "Game Over", 40, RED, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50, align="center"))
+            mark(draw_text(surface, "Press R to Restart or Q to Quit", 24, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 10, align="center"))
+
+
+def run(ctx=None):
+    """
+    Play the game until the player leaves it.
+
+    Args:
+        ctx (Runtime): The shared display context from the launcher. A
+            window of the game's own size is opened when omitted.
+    """
+    standalone = ctx is None
+    if standalone:
+        ctx = Runtime(LOGICAL_SIZE, "Shadow Ops")
+    preload()
+
+    screen = ctx.begin(LOGICAL_SIZE, "Shadow Ops")
+    scheduler = FrameScheduler(ctx.clock)
+    renderer = make_renderer()
+    controls = InputReader(ctx)
+    effects = ParticleSystem()
+
+    seed = new_seed()
+    state = new_state(seed)
+    scores.load()
+    if standalone:
+        # The launcher freezes its heap once at startup; freezing again on
+        # every launch would pin each session's leftovers for good
+        freeze_heap()
+    # Variable steps are not deterministic, so they cannot be replayed
+    recorder = start_recording("shadow_ops", enabled=RECORD_REPLAYS and not scheduler.variable)
+    recorder.start_round(seed)
+    try:
+        while True:
+            # Nothing moves on the game over screen, so refresh it slowly
+            scheduler.mode = STATIC if state.game_over else ACTIVE
+            events = scheduler.wait()
+            profiler.begin_frame()
+
+            with profiler.phase("input"):
+                frame_input = controls.poll(events)
+                if frame_input.quit:
+                    ctx.quit()
+                if frame_input.resized:
+                    # The scene may now draw on another buffer
+                    screen = ctx.surface
+                if frame_input.resized or frame_input.exposed:
+                    renderer.invalidate()
+                for key in frame_input.keys:
+                    if key == pygame.K_ESCAPE:
+                        return
+                    if state.game_over:
+                        if key == pygame.K_r:
+                            seed = new_seed()
+                            state = new_state(seed)
+                            effects.clear()
+                            recorder.start_round(seed)
+                        elif key == pygame.K_q:
+                            return
+                inputs = frame_input.actions
+
+            with profiler.phase("update"):
+                speed, game_over = state.enemy_speed, state.game_over
+                position = state.player.center
+                steps, dt = scheduler.advance()
+                for _ in range(steps):
+                    recorder.tick(inputs)
+                    step(state, inputs, dt)
+                # Sounds, effects and scores are handled here, outside the
+                # pure simulation
+                effects.update(steps * dt)
+                if state.player.center != position:
+                    effects.emit(DASH_TRAIL, (position[0],), (position[1],))
+                if state.enemy_speed > speed:
+                    audio.play("shadow.speed_up")
+                if state.game_over and not game_over:
+                    effects.burst(CRASH_SPARKS, state.player.center, CRASH_PARTICLES, speed=5.0)
+                    audio.play("shadow.game_over")
+                    scores.submit("shadow_ops", state.score, ticks=state.frame, seed=seed)
+
+            with profiler.phase("draw"):
+                render(screen, state, renderer)
+                for rect in effects.draw(screen):
+                    renderer.add(rect)
+                renderer.add(profiler.draw_overlay(screen))
+
+            with profiler.phase("flip"):
+                renderer.present(ctx)
+            profiler.end_frame()
+    finally:
+        recorder.close()
+
+
+if __name__ == "__main__":
+    run()
@@ -3,11 +3,19 @@
 Arena Blitz Game Launcher
 Main entry point for the game launcher application.
 """
-import os
-import sys
 import pygame
 
-pygame.init()
+from common import draw
+from common.audio import audio
+from common.input import HitIndex, InputReader
+from common.loader import loader
+from common.pool import freeze_heap
+from common.profiler import profiler
+from common.registry import GameRegistry
+from common.runtime import Runtime
+from common.scheduler import IDLE, STATIC, FrameScheduler
+from common.scores import scores
+from common.text import get_font, render_text
 
 # Constants
 SCREEN_WIDTH = 900
@@ -20,42 +28,61 @@ BUTTON_HOVER_COLOR = (65, 125, 185)  # Lighter blue on hover
 BUTTON_TEXT_COLOR = (240, 240, 255)  # Bright text on buttons
 ACCENT_COLOR = (255, 165, 0)  # Orange accent color
 
+BUTTON_WIDTH = 350
+BUTTON_HEIGHT = 70
+BUTTON_SPACING = 30
+BUTTON_START_Y = 180
+GLOW_SIZE = 5
+BOARD_ROWS = 5
+BOARD_LINE_HEIGHT = 22
+LOADING_BAR = pygame.Rect((SCREEN_WIDTH - BUTTON_WIDTH) // 2, SCREEN_HEIGHT - 70, BUTTON_WIDTH, 16)
+LOADING_AREA = LOADING_BAR.inflate(0, 80).move(0, -20)
+
 class GameLauncher:
     def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption(TITLE)
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont('Arial', 26, bold=True)
-        self.title_font = pygame.font.SysFont('Arial', 42, bold=True)
+        # One window, clock and mixer for the launcher and every game
+        self.ctx = Runtime((SCREEN_WIDTH, SCREEN_HEIGHT), TITLE)
+        self.screen = self.ctx.begin((SCREEN_WIDTH, SCREEN_HEIGHT), TITLE)
+        self.clock = self.ctx.clock
+        self.scheduler = FrameScheduler(self.clock, mode=IDLE)
+        self.controls = InputReader(self.ctx)
+        self.font = get_font('Arial', 26, bold=True)
+        self.title_font = get_font('Arial', 42, bold=True)
+        self.board_font = get_font('Arial', 20)
         self.running = True
 
-        self.games = [
-            {"name": "Cyber Ninja Assault", "module": "cyber_ninja_assault"},
-            {"name": "Shadow Ops", "module": "shadow_ops"}
-        ]
+        # Games are discovered from the manifests in games/*/__init__.py
+        self.registry = GameRegistry()
+        self.games = list(self.registry)
 
-    def run(self):
-        while self.running:
-            self.handle_events()
-            self.update()
-            self.render()
-            self.clock.tick(60)
+        # Retained-mode layer: everything static is baked once, and only the
+        # buttons whose hover state changed are redrawn and presented.
+        self.background = self.build_background()
+        self.buttons = self.build_buttons()
+        self.button_index = HitIndex()
+        for i, button in enumerate(self.buttons):
+            self.button_index.add(i, button["rect"])
+        self.hovered = None
+        self.dirty_buttons = set()
+        self.needs_full_redraw = True
 
-        pygame.quit()
-        sys.exit()
+        # High scores of the last game pointed at, below the buttons
+        scores.load()
+        top = self.buttons[-1]["area"].bottom + 15 if self.buttons else BUTTON_START_Y
+        self.board_area = pygame.Rect((SCREEN_WIDTH - BUTTON_WIDTH) // 2, top,
+                                      BUTTON_WIDTH, (BOARD_ROWS + 1) * BOARD_LINE_HEIGHT)
+        self.board_game = None
+        self.board_dirty = False
 
-    def handle_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                self.check_button_click(event.pos)
+        # (game, prewarm future) while a clicked game's assets stream in
+        self.loading = None
 
-    def update(self):
-        pass
+        # Startup is done; keep the collector off everything loaded so far
+        freeze_heap()
 
-    def render(self):
-        # Create gradient background
+    def build_background(self):
+        """Bake the gradient and title into a single display-format surface."""
+        background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
         for y in range(SCREEN_HEIGHT):
             # Calculate gradient color (darker at top, lighter at bottom)
             gradient_factor = y / SCREEN_HEIGHT
@@ -65,79 +92,215 @@ class GameLauncher:
             r = min(r, 255)
             g = min(g, 255)
             b = min(b, 255)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (SCREEN_WIDTH, y))
-        
+            pygame.draw.line(background, (r, g, b), (0, y), (SCREEN_WIDTH, y))
+
         # Draw title with shadow effect
         shadow_text = self.title_font.render(TITLE, True, (20, 20, 30))
         shadow_rect = shadow_text.get_rect(center=(SCREEN_WIDTH // 2 + 3, 53))
-        self.screen.blit(shadow_text, shadow_rect)
-        
+        background.blit(shadow_text, shadow_rect)
+
         title_text = self.title_font.render(TITLE, True, TEXT_COLOR)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 50))
-        self.screen.blit(title_text, title_rect)
-
-        button_height = 70
-        button_width = 350
-        button_spacing = 30
-        start_y = 180
+        background.blit(title_text, title_rect)
+        return background
 
+    def build_buttons(self):
+        """Lay out the game buttons and pre-render their normal/hover sprites."""
+        buttons = []
         for i, game in enumerate(self.games):
-            button_y = start_y + i * (button_height + button_spacing)
-            button_rect = pygame.Rect(
-                (SCREEN_WIDTH - button_width) // 2,
+            button_y = BUTTON_START_Y + i * (BUTTON_HEIGHT + BUTTON_SPACING)
+            rect = pygame.Rect(
+                (SCREEN_WIDTH - BUTTON_WIDTH) // 2,
                 button_y,
-                button_width,
-                button_height
+                BUTTON_WIDTH,
+                BUTTON_HEIGHT
             )
-            mouse_pos = pygame.mouse.get_pos()
-            hover = button_rect.collidepoint(mouse_pos)
-            color = BUTTON_HOVER_COLOR if hover else BUTTON_COLOR
-            
-            # Draw button with gradient and glow effect
-            for offset in range(5, 0, -1):
-                if hover:
-                    glow_rect = button_rect.inflate(offset*2, offset*2)
-                    glow_color = (ACCENT_COLOR[0], ACCENT_COLOR[1], ACCENT_COLOR[2], 100 - offset*20)
-                    pygame.draw.rect(self.screen, glow_color, glow_rect, border_radius=10)
-            
-            # Draw main button
-            pygame.draw.rect(self.screen, color, button_rect, border_radius=8)
-            
-            # Add highlight to top of button
-            highlight_rect = pygame.Rect(button_rect.left + 2, button_rect.top + 2, 
-                                        button_rect.width - 4, 10)
-            pygame.draw.rect(self.screen, (color[0] + 30, color[1] + 30, color[2] + 30), 
-                            highlight_rect, border_radius=8)
-            
-            button_text = self.font.render(game["name"], True, BUTTON_TEXT_COLOR)
-            text_rect = button_text.get_rect(center=button_rect.center)
-            self.screen.blit(button_text, text_rect)
-
-        pygame.display.flip()
+            buttons.append({
+                "game": game,
+                "rect": rect,
+                # Area covered by either variant, glow included
+                "area": rect.inflate(GLOW_SIZE * 2, GLOW_SIZE * 2),
+                "normal": self.build_button_sprite(game.title, hover=False),
+                "hover": self.build_button_sprite(game.title, hover=True),
+            })
+        return buttons
 
-    def check_button_click(self, pos):
-        button_height = 70
-        button_width = 350
-        button_spacing = 30
-        start_y = 180
+    def build_button_sprite(self, name, hover):
+        size = (BUTTON_WIDTH + GLOW_SIZE * 2, BUTTON_HEIGHT + GLOW_SIZE * 2)
+        sprite = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        button_rect = pygame.Rect(GLOW_SIZE, GLOW_SIZE, BUTTON_WIDTH, BUTTON_HEIGHT)
+        color = BUTTON_HOVER_COLOR if hover else BUTTON_COLOR
 
-        for i, game in enumerate(self.games):
-            button_y = start_y + i * (button_height + button_spacing)
-            button_rect = pygame.Rect(
-                (SCREEN_WIDTH - button_width) // 2,
-                button_y,
-                button_width,
-                button_height
-            )
-            if button_rect.collidepoint(pos):
-                self.launch_game(game["module"])
+        # Draw button with gradient and glow effect. pygame.draw writes the
+        # alpha into the sprite rather than blending, so each smaller ring
+        # replaces the middle of the last with a more opaque one
+        if hover:
+            for offset in range(GLOW_SIZE, 0, -1):
+                glow_rect = button_rect.inflate(offset*2, offset*2)
+                alpha = 255 * (GLOW_SIZE + 1 - offset) // (GLOW_SIZE + 1)
+                pygame.draw.rect(sprite, (*ACCENT_COLOR, alpha), glow_rect, border_radius=10)
+
+        # Draw main button
+        pygame.draw.rect(sprite, color, button_rect, border_radius=8)
+
+        # Add highlight to top of button
+        highlight_rect = pygame.Rect(button_rect.left + 2, button_rect.top + 2,
+                                    button_rect.width - 4, 10)
+        pygame.draw.rect(sprite, (color[0] + 30, color[1] + 30, color[2] + 30),
+                        highlight_rect, border_radius=8)
+
+        button_text = self.font.render(name, True, BUTTON_TEXT_COLOR)
+        text_rect = button_text.get_rect(center=button_rect.center)
+        sprite.blit(button_text, text_rect)
+        return sprite
+
+    def run(self):
+        while self.running:
+            # The menu only changes in response to input
+            self.handle_events(self.scheduler.wait())
+            profiler.begin_frame()
+            self.update()
+            with profiler.phase("draw"):
+                self.render()
+            profiler.end_frame()
+
+        self.registry.shutdown()
+        scores.close()
+        loader.shutdown()
+        audio.shutdown()
+        self.ctx.quit()
+
+    def handle_events(self, events):
+        frame_input = self.controls.poll(events)
+        if frame_input.quit:
+            self.running = False
+        if frame_input.resized:
+            self.screen = self.ctx.surface
+        if frame_input.resized or frame_input.exposed:
+            self.needs_full_redraw = True
+        if frame_input.mouse is not None:
+            self.set_hovered(self.button_at(frame_input.mouse))
+        for pos in frame_input.clicks:
+            self.check_button_click(pos)
+
+    def update(self):
+        if self.loading is not None:
+            self.update_loading()
+
+    def update_loading(self):
+        game, future = self.loading
+        # Display conversion has to happen here; spread it over frames
+        remaining = loader.finalize(limit=2)
+        if future.done() and not loader.busy and not remaining:
+            self.loading = None
+            self.scheduler.mode = IDLE
+            self.launch_game(game)
+            # Take the window back; the game drew over all of it
+            self.screen = self.ctx.begin((SCREEN_WIDTH, SCREEN_HEIGHT), TITLE)
+            self.set_hovered(self.button_at(self.ctx.to_logical(pygame.mouse.get_pos())))
+            self.needs_full_redraw = True
+
+    def loading_progress(self):
+        # Importing the module is the first half, its streamed assets the rest
+        game, future = self.loading
+        if not future.done():
+            return 0.0
+        return 0.5 + 0.5 * loader.progress()
+
+    def button_at(self, pos):
+        return self.button_index.at(pos)
+
+    def set_hovered(self, index):
+        if index == self.hovered:
+            return
+        if self.hovered is not None:
+            self.dirty_buttons.add(self.hovered)
+        if index is not None:
+            self.dirty_buttons.add(index)
+            game = self.buttons[index]["game"]
+            if game is not self.board_game:
+                self.board_game = game
+                self.board_dirty = True
+            # Import and load the game in the background while it is pointed at
+            self.registry.prewarm(self.buttons[index]["game"])
+        self.hovered = index
+
+    def draw_button(self, index):
+        button = self.buttons[index]
+        sprite = button["hover"] if index == self.hovered else button["normal"]
+        # Restore the background first so a vanishing glow leaves no trace
+        self.screen.blit(self.background, button["area"], button["area"])
+        self.screen.blit(sprite, button["area"])
+        return button["area"]
+
+    def draw_board(self):
+        area = self.board_area
+        self.screen.blit(self.background, area, area)
+        game = self.board_game
+        if game is not None:
+            lines = [f"High scores: {game.title}"]
+            for rank, entry in enumerate(scores.top(game.name, BOARD_ROWS), 1):
+                lines.append(f"{rank}.  {entry.score}")
+            if len(lines) == 1:
+                lines.append("No scores yet")
+            for i, line in enumerate(lines):
+                color = ACCENT_COLOR if i == 0 else TEXT_COLOR
+                text = render_text(self.board_font, line, color)
+                self.screen.blit(text, text.get_rect(midtop=(area.centerx, area.top + i * BOARD_LINE_HEIGHT)))
+        self.board_dirty = False
+        return area
+
+    def draw_loading(self):
+        game, _ = self.loading
+        self.screen.blit(self.background, LOADING_AREA, LOADING_AREA)
+        label = render_text(self.font, f"Loading {game.title}...", TEXT_COLOR)
+        self.screen.blit(label, label.get_rect(midbottom=(LOADING_BAR.centerx, LOADING_BAR.top - 10)))
+        filled = LOADING_BAR.copy()
+        filled.width = int(LOADING_BAR.width * self.loading_progress())
+        draw.rect(self.screen, ACCENT_COLOR, filled, border_radius=4)
+        draw.rect(self.screen, BUTTON_TEXT_COLOR, LOADING_BAR, 2, border_radius=4)
+        return LOADING_AREA
+
+    def render(self):
+        if not self.ctx.retained and (self.dirty_buttons or self.board_dirty or self.loading is not None):
+            # A GPU canvas keeps nothing between frames
+            self.needs_full_redraw = True
+        if self.needs_full_redraw:
+            self.screen.blit(self.background, (0, 0))
+            for i in range(len(self.buttons)):
+                self.draw_button(i)
+            self.draw_board()
+            if self.loading is not None:
+                self.draw_loading()
+            self.ctx.present()
+            self.needs_full_redraw = False
+        else:
+            dirty = [self.draw_button(i) for i in self.dirty_buttons]
+            if self.board_dirty:
+                dirty.append(self.draw_board())
+            if self.loading is not None:
+                dirty.append(self.draw_loading())
+            if dirty:
+                self.ctx.present(dirty)
+        self.dirty_buttons.clear()
+
+    def check_button_click(self, pos):
+        index = self.button_at(pos)
+        if index is not None and self.loading is None:
+            # Launch once the game's assets are in; a game pre-warmed on
+            # hover usually is already, and starts without a loading bar
+            game = self.buttons[index]["game"]
+            loader.begin_batch()
+            self.loading = (game, self.registry.prewarm(game))
+            self.scheduler.mode = STATIC
 
-    def launch_game(self, module_name):
+    def launch_game(self, game):
+        module_name = game.name
         print(f"[LAUNCHER] Launching {module_name}...")
         try:
-            game_module = __import__(f"games.{module_name}.main", fromlist=["main"])
+            game_module = self.registry.load(game)
             if hasattr(game_module, "run"):
-                game_module.run()
+                game_module.run(self.ctx)
             elif hasattr(game_module, "main"):
                 game_module.main()
             else: